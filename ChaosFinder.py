@@ -1,5 +1,5 @@
 import numpy as np
-from numba import njit
+from numba import njit, prange
 import scipy
 import math
 import sys
@@ -12,9 +12,16 @@ import matplotlib.pyplot as plt
 from matplotlib import cm
 
 # Kaplan-Yorke conjecture
+@njit(cache=True, fastmath=True, error_model='numpy', boundscheck=False)
 def fractal_dimension(maxLE,minLE):
 	if maxLE < 0.0:
 		return 0.0
+	elif minLE == 0.0:
+		# Degenerate spectrum; report dimension 1 so
+		# both exclusion predicates reject it (the
+		# numpy error model would silently divide by
+		# zero here instead of raising)
+		return 1.0
 	else:
 		sum_ = maxLE + minLE
 		if sum_ > 0.0:
@@ -25,36 +32,30 @@ def fractal_dimension(maxLE,minLE):
 			pos_sum = maxLE
 		return j + (pos_sum / abs(minLE))
 
-def get_random_args(n):
-	return 2.4*np.random.rand(n)-1.2
-
-def get_random_args_(n):
-	args = np.zeros(n)
-	for i in range(n):
-		args[i] = round(-1.2 + np.random.randint(25)*0.1, 1)
-	return args
-
-@njit
+@njit(cache=True, fastmath=True, error_model='numpy', boundscheck=False)
 def check_unbounded(x, y, thresh):
 	'''
 	Checks if a point surpasses the supplied
 	threshold or DNE / is infinity
 	'''
-	return (abs(x) > thresh or abs(y) > thresh \
+	return (math.fabs(x) > thresh or math.fabs(y) > thresh \
 		or math.isnan(x) or math.isnan(y) or
 		math.isinf(x) or math.isinf(y))
 
-@njit
+@njit(cache=True, fastmath=True, error_model='numpy', boundscheck=False)
 def check_movement(x,y,xp,yp):
 	'''
 	Checks if the current point has moved
 	from previous point (to rule out fixed
-	points)
+	points). Both coordinates must be stuck:
+	a single coordinate matching its
+	predecessor is common for chaotic maps
+	and is not a fixed point.
 	'''
-	return (abs(x-xp) < 1e-16 or abs(y-yp) < 1e-16)
+	return (math.fabs(x-xp) < 1e-16 and math.fabs(y-yp) < 1e-16)
 
 
-@njit
+@njit(cache=True, fastmath=True, error_model='numpy', boundscheck=False)
 def f(args, x, y):
 	'''
 	Returns Xn+1 (or Yn+1) given Xn, Yn
@@ -63,42 +64,93 @@ def f(args, x, y):
 	a,b,c,d,e,f = args
 	return a + b*x + c*(x*x) + d*(x*y) + e*y + f*(y*y)
 
-@njit
+@njit(cache=True, fastmath=True, error_model='numpy', boundscheck=False)
 def J(args1, args2, x, y):
 	'''
 	Returns the local jacobian matrix of
 	a quadratic two-dimensional map given
-	(x,y) and coefficients of the map
+	(x,y) and coefficients of the map, as
+	four scalars (m00, m01, m10, m11) to
+	avoid allocating a 2x2 array per call
 	'''
 	a1,b1,c1,d1,e1,f1 = args1
 	a2,b2,c2,d2,e2,f2 = args2
 
-	return np.array(
-			[
-			[2*c1*x + d1*y + b1, d1*x + 2*f1*y + e1],
-			[2*c2*x + d2*y + b2, d2*x + 2*f2*y + e2]
-			] 
-			)
+	return (2*c1*x + d1*y + b1, d1*x + 2*f1*y + e1,
+		2*c2*x + d2*y + b2, d2*x + 2*f2*y + e2)
 
-@njit
+@njit(cache=True, fastmath=True, error_model='numpy', boundscheck=False)
 def f_cubic(a,x,y):
 	return a[0] + a[1]*x + a[2]*x*x + a[3]*(x*x*x) + \
 		a[4]*x*x*y + a[5]*x*y + a[6]*x*y*y + a[7]*y + \
 		a[8]*y*y + a[9]*y*y*y
 
-@njit
+@njit(cache=True, fastmath=True, error_model='numpy', boundscheck=False)
 def J_cubic(args1, args2, x, y):
 	a1,a2,a3,a4,a5,a6,a7,a8,a9,a10 = args1
 	b1,b2,b3,b4,b5,b6,b7,b8,b9,b10 = args2
 
-	return np.array(
-		[
-		[a2 + 2*a3*x + 3*a4*(x*x) + 2*a5*y*x + a6*y + a7*(y*y),
-		a5*(x*x) + a6*x + a7*x*2*y + a8 + 2*a9*y + 3*a10*y*y],
-		[b2 + 2*b3*x + 3*b4*(x*x) + 2*b5*y*x + b6*y + b7*(y*y),
-		b5*(x*x) + b6*x + b7*x*2*y + b8 + 2*b9*y + 3*b10*y*y]
-		]
-		)
+	return (a2 + 2*a3*x + 3*a4*(x*x) + 2*a5*y*x + a6*y + a7*(y*y),
+		a5*(x*x) + a6*x + a7*x*2*y + a8 + 2*a9*y + 3*a10*y*y,
+		b2 + 2*b3*x + 3*b4*(x*x) + 2*b5*y*x + b6*y + b7*(y*y),
+		b5*(x*x) + b6*x + b7*x*2*y + b8 + 2*b9*y + 3*b10*y*y)
+
+
+@njit(inline='always', fastmath=True)
+def step_quadratic(args1, args2, x, y):
+	'''
+	Fused map + jacobian evaluation for the
+	quadratic map. Computes Xn+1, Yn+1 and the
+	local jacobian at the new point in one pass,
+	sharing the polynomial subexpressions.
+	'''
+	a1,b1,c1,d1,e1,f1 = args1
+	a2,b2,c2,d2,e2,f2 = args2
+
+	xx = x*x
+	xy = x*y
+	yy = y*y
+
+	xn = a1 + b1*x + c1*xx + d1*xy + e1*y + f1*yy
+	yn = a2 + b2*x + c2*xx + d2*xy + e2*y + f2*yy
+
+	# Jacobian at the new point
+	m00 = 2*c1*xn + d1*yn + b1
+	m01 = d1*xn + 2*f1*yn + e1
+	m10 = 2*c2*xn + d2*yn + b2
+	m11 = d2*xn + 2*f2*yn + e2
+
+	return xn, yn, m00, m01, m10, m11
+
+@njit(inline='always', fastmath=True)
+def step_cubic(args1, args2, x, y):
+	'''
+	Fused map + jacobian evaluation for the
+	cubic map (see step_quadratic)
+	'''
+	a1,a2,a3,a4,a5,a6,a7,a8,a9,a10 = args1
+	b1,b2,b3,b4,b5,b6,b7,b8,b9,b10 = args2
+
+	xx = x*x
+	xy = x*y
+	yy = y*y
+
+	xn = a1 + a2*x + a3*xx + a4*xx*x + a5*xx*y + \
+		a6*xy + a7*x*yy + a8*y + a9*yy + a10*yy*y
+	yn = b1 + b2*x + b3*xx + b4*xx*x + b5*xx*y + \
+		b6*xy + b7*x*yy + b8*y + b9*yy + b10*yy*y
+
+	# Jacobian at the new point
+	xnxn = xn*xn
+	xnyn = xn*yn
+	ynyn = yn*yn
+
+	m00 = a2 + 2*a3*xn + 3*a4*xnxn + 2*a5*xnyn + a6*yn + a7*ynyn
+	m01 = a5*xnxn + a6*xn + 2*a7*xnyn + a8 + 2*a9*yn + 3*a10*ynyn
+	m10 = b2 + 2*b3*xn + 3*b4*xnxn + 2*b5*xnyn + b6*yn + b7*ynyn
+	m11 = b5*xnxn + b6*xn + 2*b7*xnyn + b8 + 2*b9*yn + 3*b10*ynyn
+
+	return xn, yn, m00, m01, m10, m11
 
 
 # @njit
@@ -120,9 +172,11 @@ def J_cubic(args1, args2, x, y):
 # 		)
 
 
+@njit
 def exclude(maxLE, minLE, C, fd, thresh=0.):
 	return maxLE <= thresh or abs(fd - 1.) < 0.11
 
+@njit
 def exclude_cubic(maxLE, minLE, C, fd, thresh=0.):
 	exclude = maxLE <= thresh
 	for i in [1., 2.]:
@@ -145,47 +199,56 @@ def wait():
 
 
 
-@njit
-def test(args1, args2, n, N, thresh, kind='quadratic'):
+@njit(cache=True, fastmath=True, error_model='numpy', boundscheck=False)
+def test_quadratic(args1, args2, n, N, thresh):
 	x, y = 0.05, 0.05
-	v1 = np.array([1., 0.])
-	v2 = np.array([0., 1.])
 
-	if kind == 'quadratic':
-		fct = f
-		Jacobian = J
-	elif kind == 'cubic':
-		fct = f_cubic
-		Jacobian = J_cubic
-	# elif kind == 'symplectic':
-	# 	fct = f_symplectic
-	# 	Jacobian = J_symplectic
+	# Tangent vectors kept as four scalars
+	# (no per-iteration array allocations)
+	v1x, v1y = 1., 0.
+	v2x, v2y = 0., 1.
 
 	# Discard the first n points to ensure
 	# we begin LE approximation on the
-	# (potential) attractor
-	for _ in range(n):
-		xp, yp = x,y
-		x, y = fct(args1,xp,yp), fct(args2,xp,yp)
-
-		# Local jacobian
-		M = Jacobian(args1,args2,x,y)
-
-		# Jacobian matrix product
-		v1 = M.dot(v1)
-		v2 = M.dot(v2)
+	# (potential) attractor. The tangent vectors
+	# only need to stay bounded and orthogonal
+	# here, so they too are renormalized at block
+	# boundaries (no log accumulation at all).
+	it = 0
+	while it < n:
+		blk = min(LE_BLOCK, n - it)
+		for _ in range(blk):
+			xp, yp = x,y
+
+			# Fused map + local jacobian
+			x, y, m00, m01, m10, m11 = step_quadratic(args1,args2,xp,yp)
+
+			# Jacobian matrix product
+			nv1x = m00*v1x + m01*v1y
+			nv2x = m00*v2x + m01*v2y
+			nv1y = m10*v1x + m11*v1y
+			nv2y = m10*v2x + m11*v2y
+			v1x, v1y, v2x, v2y = nv1x, nv1y, nv2x, nv2y
+
+		it += blk
 
 		# Dot products
-		dot_11 = np.dot(v1,v1)
-		dot_12 = np.dot(v1,v2)
-		dot_22 = np.dot(v2,v2)
+		dot_11 = v1x*v1x + v1y*v1y
+		dot_12 = v1x*v2x + v1y*v2y
 
 		# Gram-Schmidt
-		v2 -= np.multiply((dot_12/dot_11), v1)
+		proj = dot_12/dot_11
+		v2x -= proj*v1x
+		v2y -= proj*v1y
+		dot_22 = v2x*v2x + v2y*v2y
 
 		# Normalize
-		v1 = v1/np.sqrt(dot_11)
-		v2 = v2/np.sqrt(dot_22)
+		sqrt_dot_11 = math.sqrt(dot_11)
+		sqrt_dot_22 = math.sqrt(dot_22)
+		v1x /= sqrt_dot_11
+		v1y /= sqrt_dot_11
+		v2x /= sqrt_dot_22
+		v2y /= sqrt_dot_22
 
 	minLE = 0.0
 	maxLE = 0.0
@@ -193,69 +256,358 @@ def test(args1, args2, n, N, thresh, kind='quadratic'):
 
 	count = 0
 
-	# Begin estimation
-	for _ in range(N):
-		xp, yp = x,y
-		x, y = fct(args1,xp,yp), fct(args2,xp,yp)
+	# Begin estimation. The tangent vectors are
+	# propagated raw within a block and
+	# re-orthonormalized only at block boundaries
+	# (Benettin with reorthonormalization every
+	# LE_BLOCK steps), trading N log/sqrt calls
+	# for N/LE_BLOCK of each.
+	it = 0
+	while it < N:
+		blk = min(LE_BLOCK, N - it)
+		det_prod = 1.0
+		for j in range(blk):
+			xp, yp = x,y
+
+			# Fused map + local jacobian
+			x, y, m00, m01, m10, m11 = step_quadratic(args1,args2,xp,yp)
+
+			# Check if bounded
+			if check_unbounded(x,y,thresh):
+				return np.array([-1.,-1.,-1.])
 
-		# Local jacobian
-		M = Jacobian(args1,args2,x,y)
+			# Check if fixed point (sampled every 16th
+			# iteration; a stuck trajectory stays stuck)
+			if ((it + j) & 15) == 0:
+				if check_movement(x,y,xp,yp):
+					if count >= 15:
+						return np.array([-1.,-1.,-1.])
+					else:
+						count += 1
+				elif count > 0:
+					count -= 1
+
+			# Jacobian matrix product
+			nv1x = m00*v1x + m01*v1y
+			nv2x = m00*v2x + m01*v2y
+			nv1y = m10*v1x + m11*v1y
+			nv2y = m10*v2x + m11*v2y
+			v1x, v1y, v2x, v2y = nv1x, nv1y, nv2x, nv2y
+
+			# Accumulate contraction (2x2 determinant)
+			det_prod *= math.fabs(m00*m11 - m01*m10)
+
+		it += blk
 
-		# Check if bounded
-		if check_unbounded(x,y,thresh):
-			return np.array([-1.,-1.,-1.])
+		# Dot products
+		dot_11 = v1x*v1x + v1y*v1y
+		dot_12 = v1x*v2x + v1y*v2y
 
-		# Check if fixed point
-		if check_movement(x,y,xp,yp):
-			if count >= 15:
-				return np.array([-1.,-1.,-1.])
-			else:
-				count += 1
-		elif count > 0:
-			count -= 1
+		# Gram-Schmidt
+		proj = dot_12/dot_11
+		v2x -= proj*v1x
+		v2y -= proj*v1y
+		dot_22 = v2x*v2x + v2y*v2y
+
+		# Norms
+		sqrt_dot_11 = math.sqrt(dot_11)
+		sqrt_dot_22 = math.sqrt(dot_22)
+
+		# Normalize
+		v1x /= sqrt_dot_11
+		v1y /= sqrt_dot_11
+		v2x /= sqrt_dot_22
+		v2y /= sqrt_dot_22
 
-		# Jacobian matrix product
-		v1 = M.dot(v1)
-		v2 = M.dot(v2)
+		# Update LEs (half the log2 of the squared
+		# norm, saving a transcendental per axis)
+		maxLE += 0.5*math.log2(dot_11)
+		minLE += 0.5*math.log2(dot_22)
+
+		# Update contraction
+		C += math.log2(det_prod)
+
+	N_f = float(N)
+
+	# Compute the averages (accumulated in log
+	# base 2, which is standard for maps)
+	maxLE = maxLE / N_f
+	minLE = minLE / N_f
+	C = C / N_f
+
+	return np.array([maxLE, minLE, C])
+
+
+@njit(cache=True, fastmath=True, error_model='numpy', boundscheck=False)
+def test_cubic(args1, args2, n, N, thresh):
+	x, y = 0.05, 0.05
+
+	# Tangent vectors kept as four scalars
+	# (no per-iteration array allocations)
+	v1x, v1y = 1., 0.
+	v2x, v2y = 0., 1.
+
+	# Discard the first n points to ensure
+	# we begin LE approximation on the
+	# (potential) attractor. The tangent vectors
+	# only need to stay bounded and orthogonal
+	# here, so they too are renormalized at block
+	# boundaries (no log accumulation at all).
+	it = 0
+	while it < n:
+		blk = min(LE_BLOCK, n - it)
+		for _ in range(blk):
+			xp, yp = x,y
+
+			# Fused map + local jacobian
+			x, y, m00, m01, m10, m11 = step_cubic(args1,args2,xp,yp)
+
+			# Jacobian matrix product
+			nv1x = m00*v1x + m01*v1y
+			nv2x = m00*v2x + m01*v2y
+			nv1y = m10*v1x + m11*v1y
+			nv2y = m10*v2x + m11*v2y
+			v1x, v1y, v2x, v2y = nv1x, nv1y, nv2x, nv2y
+
+		it += blk
 
 		# Dot products
-		dot_11 = np.dot(v1,v1)
-		dot_12 = np.dot(v1,v2)
-		dot_22 = np.dot(v2,v2)
+		dot_11 = v1x*v1x + v1y*v1y
+		dot_12 = v1x*v2x + v1y*v2y
 
-		# Norms
-		sqrt_dot_11 = np.sqrt(dot_11)
-		sqrt_dot_22 = np.sqrt(dot_22)
+		# Gram-Schmidt
+		proj = dot_12/dot_11
+		v2x -= proj*v1x
+		v2y -= proj*v1y
+		dot_22 = v2x*v2x + v2y*v2y
+
+		# Normalize
+		sqrt_dot_11 = math.sqrt(dot_11)
+		sqrt_dot_22 = math.sqrt(dot_22)
+		v1x /= sqrt_dot_11
+		v1y /= sqrt_dot_11
+		v2x /= sqrt_dot_22
+		v2y /= sqrt_dot_22
+
+	minLE = 0.0
+	maxLE = 0.0
+	C = 0.0
+
+	count = 0
+
+	# Begin estimation. The tangent vectors are
+	# propagated raw within a block and
+	# re-orthonormalized only at block boundaries
+	# (Benettin with reorthonormalization every
+	# LE_BLOCK steps), trading N log/sqrt calls
+	# for N/LE_BLOCK of each.
+	it = 0
+	while it < N:
+		blk = min(LE_BLOCK, N - it)
+		det_prod = 1.0
+		for j in range(blk):
+			xp, yp = x,y
+
+			# Fused map + local jacobian
+			x, y, m00, m01, m10, m11 = step_cubic(args1,args2,xp,yp)
+
+			# Check if bounded
+			if check_unbounded(x,y,thresh):
+				return np.array([-1.,-1.,-1.])
+
+			# Check if fixed point (sampled every 16th
+			# iteration; a stuck trajectory stays stuck)
+			if ((it + j) & 15) == 0:
+				if check_movement(x,y,xp,yp):
+					if count >= 15:
+						return np.array([-1.,-1.,-1.])
+					else:
+						count += 1
+				elif count > 0:
+					count -= 1
+
+			# Jacobian matrix product
+			nv1x = m00*v1x + m01*v1y
+			nv2x = m00*v2x + m01*v2y
+			nv1y = m10*v1x + m11*v1y
+			nv2y = m10*v2x + m11*v2y
+			v1x, v1y, v2x, v2y = nv1x, nv1y, nv2x, nv2y
+
+			# Accumulate contraction (2x2 determinant)
+			det_prod *= math.fabs(m00*m11 - m01*m10)
+
+		it += blk
+
+		# Dot products
+		dot_11 = v1x*v1x + v1y*v1y
+		dot_12 = v1x*v2x + v1y*v2y
 
 		# Gram-Schmidt
-		v2 -= np.multiply((dot_12/dot_11), v1)
+		proj = dot_12/dot_11
+		v2x -= proj*v1x
+		v2y -= proj*v1y
+		dot_22 = v2x*v2x + v2y*v2y
+
+		# Norms
+		sqrt_dot_11 = math.sqrt(dot_11)
+		sqrt_dot_22 = math.sqrt(dot_22)
 
 		# Normalize
-		v1 = v1/sqrt_dot_11
-		v2 = v2/sqrt_dot_22
+		v1x /= sqrt_dot_11
+		v1y /= sqrt_dot_11
+		v2x /= sqrt_dot_22
+		v2y /= sqrt_dot_22
 
-		# Update LEs
-		maxLE += np.log(sqrt_dot_11)
-		minLE += np.log(sqrt_dot_22)
+		# Update LEs (half the log2 of the squared
+		# norm, saving a transcendental per axis)
+		maxLE += 0.5*math.log2(dot_11)
+		minLE += 0.5*math.log2(dot_22)
 
 		# Update contraction
-		C += np.log(abs(np.linalg.det(M)))
+		C += math.log2(det_prod)
 
 	N_f = float(N)
-	log2 = np.log(2.) # log base 2 is standard for maps
 
-	# Compute the averages
-	maxLE = maxLE / N_f / log2
-	minLE = minLE / N_f / log2
-	C = C / N_f / log2
+	# Compute the averages (accumulated in log
+	# base 2, which is standard for maps)
+	maxLE = maxLE / N_f
+	minLE = minLE / N_f
+	C = C / N_f
 
 	return np.array([maxLE, minLE, C])
 
 
+# Candidates tested per parallel batch in
+# the rejection-sampling drivers
+BATCH = 256
+
+# Steps between tangent-vector
+# reorthonormalizations in the LE estimation.
+# Must stay small: over a block the v1/v2
+# magnitude contrast grows by ~LE_BLOCK*(l1-l2)
+# bits (base 2), and once that nears float64's
+# 52-bit mantissa the boundary Gram-Schmidt
+# only recovers rounding noise and minLE floors.
+# 8 keeps strongly dissipative maps well inside
+# the mantissa while still amortizing the
+# log/sqrt calls.
+LE_BLOCK = 8
+
+@njit(parallel=True)
+def batch_test_quadratic(args1_batch, args2_batch, n, N, thresh):
+	'''
+	Runs test_quadratic on a (B, 6) batch of
+	candidate maps in parallel, returning a
+	(B, 3) array of (maxLE, minLE, C) rows
+	'''
+	B = args1_batch.shape[0]
+	out = np.zeros((B, 3))
+	for b in prange(B):
+		out[b] = test_quadratic(args1_batch[b], args2_batch[b],
+			n, N, thresh)
+	return out
+
+@njit(parallel=True)
+def batch_test_cubic(args1_batch, args2_batch, n, N, thresh):
+	'''
+	Same as batch_test_quadratic for (B, 10)
+	batches of cubic maps
+	'''
+	B = args1_batch.shape[0]
+	out = np.zeros((B, 3))
+	for b in prange(B):
+		out[b] = test_cubic(args1_batch[b], args2_batch[b],
+			n, N, thresh)
+	return out
+
+
+@njit
+def sample_args(n, use_alphabet):
+	'''
+	Draws one length-n coefficient vector, either
+	on the 0.1 alphabet grid or uniform in
+	[-1.2, 1.2)
+	'''
+	args = np.empty(n)
+	if use_alphabet:
+		for j in range(n):
+			args[j] = round(np.random.randint(-12, 13)*0.1, 1)
+	else:
+		for j in range(n):
+			args[j] = 2.4*np.random.rand()-1.2
+	return args
+
+@njit
+def sample_pair(n, use_alphabet):
+	return sample_args(n, use_alphabet), sample_args(n, use_alphabet)
+
 @njit
-def iterate(args1, args2, N, kind='quadratic'):
+def sample_batch(B, n, use_alphabet):
+	'''
+	Draws a (B, n) batch of random coefficients,
+	either on the 0.1 alphabet grid or uniform in
+	[-1.2, 1.2)
+	'''
+	args = np.empty((B, n))
+	if use_alphabet:
+		for i in range(B):
+			for j in range(n):
+				args[i, j] = round(np.random.randint(-12, 13)*0.1, 1)
+	else:
+		for i in range(B):
+			for j in range(n):
+				args[i, j] = 2.4*np.random.rand()-1.2
+	return args
+
+@njit
+def find_next_quadratic(N_trans, N_test, thresh, LE_thresh, use_alphabet):
+	'''
+	Runs the whole rejection search in native
+	code: samples BATCH quadratic candidates per
+	round, LE-tests them in parallel and returns
+	the first one passing the exclusion condition
+	'''
+	while True:
+		args1_batch = sample_batch(BATCH, 6, use_alphabet)
+		args2_batch = sample_batch(BATCH, 6, use_alphabet)
+		results = batch_test_quadratic(args1_batch, args2_batch,
+			N_trans, N_test, thresh)
+		for b in range(BATCH):
+			maxLE, minLE, C = results[b, 0], results[b, 1], results[b, 2]
+			fd = fractal_dimension(maxLE, minLE)
+			if not exclude(maxLE, minLE, C, fd, thresh=LE_thresh):
+				return args1_batch[b], args2_batch[b], maxLE, minLE, C, fd
+
+@njit
+def find_next_cubic(N_trans, N_test, thresh, LE_thresh, use_alphabet):
+	'''
+	Same as find_next_quadratic for cubic maps
+	'''
+	while True:
+		args1_batch = sample_batch(BATCH, 10, use_alphabet)
+		args2_batch = sample_batch(BATCH, 10, use_alphabet)
+		results = batch_test_cubic(args1_batch, args2_batch,
+			N_trans, N_test, thresh)
+		for b in range(BATCH):
+			maxLE, minLE, C = results[b, 0], results[b, 1], results[b, 2]
+			fd = fractal_dimension(maxLE, minLE)
+			if not exclude_cubic(maxLE, minLE, C, fd, thresh=LE_thresh):
+				return args1_batch[b], args2_batch[b], maxLE, minLE, C, fd
+
+
+@njit(cache=True, fastmath=True, error_model='numpy', boundscheck=False)
+def iterate(args1, args2, N, kind='quadratic', n_trans=0):
+	'''
+	Iterates the map N times and returns the
+	trajectory as two contiguous 1D arrays
+	(x, y stay in registers across the loop).
+	The first n_trans steps are burned off in a
+	store-free register recurrence so the output
+	holds only on-attractor points.
+	'''
 	x, y = 0.05, 0.05
-	pts = np.zeros((N,3))
+	xs = np.empty(N)
+	ys = np.empty(N)
 
 	if kind == 'quadratic':
 		fct = f
@@ -264,60 +616,178 @@ def iterate(args1, args2, N, kind='quadratic'):
 	# elif kind == 'symplectic':
 	# 	fct = f_symplectic
 
+	for i in range(n_trans):
+		x,y = fct(args1,x,y),fct(args2,x,y)
 	for i in range(N):
-		xp, yp = x,y
 		x,y = fct(args1,x,y),fct(args2,x,y)
-		pts[i,0], pts[i,1] = x,y
-	return pts
+		xs[i] = x
+		ys[i] = y
+	return xs, ys
+
+@njit(parallel=True)
+def iterate_multi(args1, args2, N, K, kind='quadratic', n_trans=0):
+	'''
+	Runs K independent trajectories of N points
+	each in parallel (for ensembles / bifurcation
+	scans); single-trajectory plotting stays on
+	the scalar iterate path. Each chain burns off
+	n_trans store-free steps first.
+	'''
+	xs = np.empty((K, N))
+	ys = np.empty((K, N))
+	for k in prange(K):
+		# Slightly perturbed initial conditions so
+		# the trajectories decorrelate
+		x, y = 0.05 + 1e-6*k, 0.05
+		if kind == 'quadratic':
+			for i in range(n_trans):
+				x,y = f(args1,x,y),f(args2,x,y)
+			for i in range(N):
+				x,y = f(args1,x,y),f(args2,x,y)
+				xs[k, i] = x
+				ys[k, i] = y
+		elif kind == 'cubic':
+			for i in range(n_trans):
+				x,y = f_cubic(args1,x,y),f_cubic(args2,x,y)
+			for i in range(N):
+				x,y = f_cubic(args1,x,y),f_cubic(args2,x,y)
+				xs[k, i] = x
+				ys[k, i] = y
+	return xs, ys
+
+@njit(cache=True, fastmath=True, error_model='numpy', boundscheck=False)
+def iterate_le(args1, args2, n, N, kind='quadratic'):
+	'''
+	Fused plotting pass: a single loop over the coefficient set both
+	emits the N-point trajectory and accumulates the Lyapunov
+	spectrum (blocked Benettin, exactly as in the testers). The plot
+	run thereby doubles as an LE measurement over far more iterations
+	than the search's test pass, at the cost of a few fused scalar
+	ops that ride along in registers.
+	Returns (xs, ys, maxLE, minLE, C).
+	'''
+	if kind == 'quadratic':
+		step = step_quadratic
+	elif kind == 'cubic':
+		step = step_cubic
+
+	x, y = 0.05, 0.05
+	v1x, v1y = 1., 0.
+	v2x, v2y = 0., 1.
+
+	# Transient: land on the attractor before storing or measuring
+	# anything -- pure register recurrence, no memory traffic. The
+	# tangent vectors only need to stay bounded and orthogonal here.
+	it = 0
+	while it < n:
+		blk = min(LE_BLOCK, n - it)
+		for _ in range(blk):
+			x, y, m00, m01, m10, m11 = step(args1, args2, x, y)
+			nv1x = m00*v1x + m01*v1y
+			nv2x = m00*v2x + m01*v2y
+			nv1y = m10*v1x + m11*v1y
+			nv2y = m10*v2x + m11*v2y
+			v1x, v1y, v2x, v2y = nv1x, nv1y, nv2x, nv2y
+		it += blk
+
+		# Gram-Schmidt + normalize at block boundaries
+		dot_11 = v1x*v1x + v1y*v1y
+		dot_12 = v1x*v2x + v1y*v2y
+		proj = dot_12/dot_11
+		v2x -= proj*v1x
+		v2y -= proj*v1y
+		dot_22 = v2x*v2x + v2y*v2y
+		sqrt_dot_11 = math.sqrt(dot_11)
+		sqrt_dot_22 = math.sqrt(dot_22)
+		v1x /= sqrt_dot_11
+		v1y /= sqrt_dot_11
+		v2x /= sqrt_dot_22
+		v2y /= sqrt_dot_22
+
+	xs = np.empty(N)
+	ys = np.empty(N)
+	maxLE = 0.0
+	minLE = 0.0
+	C = 0.0
+	it = 0
+	while it < N:
+		blk = min(LE_BLOCK, N - it)
+		det_prod = 1.0
+		for j in range(blk):
+			x, y, m00, m01, m10, m11 = step(args1, args2, x, y)
+			xs[it + j] = x
+			ys[it + j] = y
+
+			# Jacobian matrix product
+			nv1x = m00*v1x + m01*v1y
+			nv2x = m00*v2x + m01*v2y
+			nv1y = m10*v1x + m11*v1y
+			nv2y = m10*v2x + m11*v2y
+			v1x, v1y, v2x, v2y = nv1x, nv1y, nv2x, nv2y
+
+			# Accumulate contraction (2x2 determinant)
+			det_prod *= math.fabs(m00*m11 - m01*m10)
+
+		it += blk
+
+		# Dot products
+		dot_11 = v1x*v1x + v1y*v1y
+		dot_12 = v1x*v2x + v1y*v2y
+
+		# Gram-Schmidt
+		proj = dot_12/dot_11
+		v2x -= proj*v1x
+		v2y -= proj*v1y
+		dot_22 = v2x*v2x + v2y*v2y
+
+		# Normalize
+		sqrt_dot_11 = math.sqrt(dot_11)
+		sqrt_dot_22 = math.sqrt(dot_22)
+		v1x /= sqrt_dot_11
+		v1y /= sqrt_dot_11
+		v2x /= sqrt_dot_22
+		v2y /= sqrt_dot_22
+
+		# Update LEs (half the log2 of the squared
+		# norm, saving a transcendental per axis)
+		maxLE += 0.5*math.log2(dot_11)
+		minLE += 0.5*math.log2(dot_22)
+
+		# Update contraction
+		C += math.log2(det_prod)
+
+	N_f = float(N)
+	return xs, ys, maxLE/N_f, minLE/N_f, C/N_f
+
 
 def dash_find_next_map(N_plot, N_trans, N_test, use_alphabet, kind):
 	thresh = 1e6
 	LE_thresh = 1e-4
 
-	randomizer_ = get_random_args
-
-	if use_alphabet:
-		randomizer_ = get_random_args_
-
 	if kind == 'quadratic':
-		condition = exclude
-		randomizer = \
-			lambda : (randomizer_(6), randomizer_(6))
+		finder = find_next_quadratic
 	elif kind == 'cubic':
-		condition = exclude_cubic
-		randomizer = \
-			lambda : (randomizer_(10), randomizer_(10))
-
-	# Get random args between -1.2 and 1.2
-	args1, args2 = randomizer()
-	try:
-		maxLE, minLE, C = test(args1, args2, N_trans, 
-			int(N_test), thresh, kind)
-		fd = fractal_dimension(maxLE, minLE)
-	except ZeroDivisionError:
-		maxLE, minLE, C, fd = -1,-1,-1,-1
-	
-
-	# While not chaotic or no apparent fractality,
-	# try new params and test again
-	while condition(maxLE, minLE, C, fd, thresh=LE_thresh):
-		try:
-			args1, args2 = randomizer()
-			maxLE, minLE, C = test(args1, args2, N_trans, 
-				int(N_test), thresh, kind)
-			fd = fractal_dimension(maxLE, minLE)
-		except ZeroDivisionError:
-			maxLE = -1
+		finder = find_next_cubic
+
+	# The whole sample/test/exclude rejection loop
+	# runs inside the JIT'd driver; no Python
+	# round-trips per candidate
+	args1, args2, maxLE, minLE, C, fd = finder(N_trans,
+		int(N_test), thresh, LE_thresh, use_alphabet)
 
-	# Acquire points to plot image
-	pts = iterate(args1, args2, int(N_plot), kind)
+	# Acquire points to plot image. The fused pass re-measures the
+	# spectrum over the (much longer) plot run for free, so the
+	# reported exponents come from N_plot iterations, not N_test
+	xs, ys, maxLE, minLE, C = iterate_le(args1, args2, N_trans,
+		int(N_plot), kind)
+	fd = fractal_dimension(maxLE, minLE)
 
 	# Format args & results to convert to string
-	args = list(args1) + list(args2)
+	args = np.concatenate((args1, args2))
 	[maxLE, minLE, C] = list(map(lambda x: round(x, 4), [maxLE, minLE, C]))
 	fd = round(fd, 4)
 
-	return pts, args, maxLE, minLE, fd
+	return xs, ys, args, maxLE, minLE, fd
 
 
 def find_maps(N_plot, N_test, kind, canvas_size, mpl_dpi, path):
@@ -362,37 +832,14 @@ def find_maps(N_plot, N_test, kind, canvas_size, mpl_dpi, path):
 	cmaps = [cc.fire, cc.bmy, cc.bgy, cc.kbc, cc.colorwheel]
 	# cmaps += mpl_maps
 
-	randomizer_ = get_random_args
-
-	if useAlphabet:
-		randomizer_ = get_random_args_
-
 	if kind == 'quadratic':
 		condition = exclude
-		randomizer = \
-			lambda : (randomizer_(6), randomizer_(6))
+		tester = test_quadratic
+		n_args = 6
 	elif kind == 'cubic':
 		condition = exclude_cubic
-		randomizer = \
-			lambda : (randomizer_(10), randomizer_(10))
-	# elif kind == 'symplectic':
-	# 	condition = \
-	# 		lambda a,b,c,d: exclude_cubic(a,b,c,d,LE_thresh)
-	# 	def randomizer():
-	# 		xn1 = randomizer_(6)
-	# 		xn1 = np.append(xn1, 0.)
-	# 		sw = np.random.rand() < 0.5
-
-	# 		yn1 = np.zeros(7)
-	# 		yn1[0], _ = randomizer_(2)
-	# 		if sw:
-	# 			xn1[-1] = -1.
-	# 			yn1[1] = 1
-	# 		else:
-	# 			xn1[-1] = -1.
-	# 			yn1[1] = 1
-
-	# 		return xn1, yn1
+		tester = test_cubic
+		n_args = 10
 
 
 	chaos = 0
@@ -400,26 +847,19 @@ def find_maps(N_plot, N_test, kind, canvas_size, mpl_dpi, path):
 	for k in range(int(N_search)):
 
 		# Get random args between -1.2 and 1.2
-		args1, args2 = randomizer()
-		try:
-			maxLE, minLE, C = test(args1, args2, ntrans, 
-				int(N_test), thresh, kind)
-			fd = fractal_dimension(maxLE, minLE)
-		except ZeroDivisionError:
-			maxLE, minLE, C, fd = -1,-1,-1,-1
-		
+		args1, args2 = sample_pair(n_args, useAlphabet)
+		maxLE, minLE, C = tester(args1, args2, ntrans,
+			int(N_test), thresh)
+		fd = fractal_dimension(maxLE, minLE)
 
 		# While not chaotic or no apparent fractality,
 		# try new params and test again
 		while condition(maxLE, minLE, C, fd):
 			non_chaos += 1
-			try:
-				args1, args2 = randomizer()
-				maxLE, minLE, C = test(args1, args2, ntrans, 
-					int(N_test), thresh, kind)
-				fd = fractal_dimension(maxLE, minLE)
-			except ZeroDivisionError:
-				maxLE = -1
+			args1, args2 = sample_pair(n_args, useAlphabet)
+			maxLE, minLE, C = tester(args1, args2, ntrans,
+				int(N_test), thresh)
+			fd = fractal_dimension(maxLE, minLE)
 
 		chaos += 1
 
@@ -431,15 +871,15 @@ def find_maps(N_plot, N_test, kind, canvas_size, mpl_dpi, path):
 
 
 		# Acquire points to plot image
-		pts = iterate(args1, args2, int(N_plot), kind)
+		xs, ys = iterate(args1, args2, int(N_plot), kind, ntrans)
 
 		# Format args & results to convert to string
-		args = list(args1) + list(args2)
+		args = np.concatenate((args1, args2))
 		[maxLE, minLE, C] = list(map(lambda x: round(x, 4), [maxLE, minLE, C]))
 		fd = round(fd, 4)
 		
 		# Write args to file
-		file.write("ARGS: " + str(args) + "\n")
+		file.write("ARGS: " + str(list(args)) + "\n")
 		file.write("MAX, MIN, C: " + 
 			str([maxLE, minLE, C]) + "\n")
 		file.write("FRACTAL DIM: " + str(fd)+"\n")
@@ -462,9 +902,9 @@ def find_maps(N_plot, N_test, kind, canvas_size, mpl_dpi, path):
 		titleDS += f"[ * ] FRACTAL DIM [ * ] : {fd}"
 
 		cmap_i = np.random.randint(len(cmaps))
-		df = pd.DataFrame(data=pts[:,:2], columns=["x", "y"])
-		xbounds = (pts[:, 0].min()-0.2, pts[:, 0].max()+0.2)
-		ybounds = (pts[:, 1].min()-0.2, pts[:, 1].max()+0.2)
+		df = pd.DataFrame({"x": xs, "y": ys})
+		xbounds = (xs.min()-0.2, xs.max()+0.2)
+		ybounds = (ys.min()-0.2, ys.max()+0.2)
 		# print(xbounds)
 		# print(ybounds)
 		cvs = ds.Canvas(plot_width=canvas_size, plot_height=canvas_size, 
@@ -474,7 +914,7 @@ def find_maps(N_plot, N_test, kind, canvas_size, mpl_dpi, path):
 			"black").to_pil()
 		N_plot
 		if debug and scatter_debug:
-			plt.scatter(pts[:int(N_plot/100),0], pts[:int(N_plot/100),1], s=0.01)
+			plt.scatter(xs[:int(N_plot/100)], ys[:int(N_plot/100)], s=0.01)
 			plt.title(titleDS, fontdict={'size': 5})
 			plt.show()
 			wait()
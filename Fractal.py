@@ -1,7 +1,12 @@
 import numpy as np
-from numba import njit, int32, boolean
+from numba import njit, prange, get_num_threads, int32, boolean
 from chaostech.Rule import *
 from chaostech.MathTech import *
+
+# Bulk uniforms for the wrapper-fed kernels; PCG64 fills large
+# batches faster than the legacy global MT19937
+_RNG = np.random.default_rng()
+import functools
 import time
 import sys
 import scipy
@@ -28,7 +33,7 @@ def get_random_transformation():
 	return (a, b, c, d, e, f)
 
 
-@njit
+@njit(cache=True)
 def test_params(a,b,c,d,e,f):
 
 	c1 = (a**2 + d**2) < 1
@@ -39,105 +44,71 @@ def test_params(a,b,c,d,e,f):
 
 
 
-@njit
-def get_3D_rotn_matrix(a, b, c):
-	COSA = np.cos(a)
-	SINA = np.sin(a)
-	COSB = np.cos(b)
-	SINB = np.sin(b)
-	COSC = np.cos(c)
-	SINC = np.sin(c)
-
-	row1 = np.array([COSA*COSB, COSA*SINB-SINA*COSC, COSA*SINB*COSC+SINA*SINC])
-	row2 = np.array([SINA*COSB, SINA*SINB+COSA*COSC, SINA*SINB*COSC-COSA*SINC])
-	row3 = np.array([-SINB, COSB*SINC, COSB*COSC])
-
-	rot_matrix = np.eye(3)
-	rot_matrix[0] = row1
-	rot_matrix[1] = row2
-	rot_matrix[2] = row3
-
-	return rot_matrix
+@njit(inline='always')
+def get_3D_rotn_(COSA, SINA, COSB, SINB, COSC, SINC):
+	'''
+	The nine rotation matrix entries as scalars, from
+	precomputed sines and cosines of yaw/pitch/roll
+	'''
+	return (COSA*COSB, COSA*SINB-SINA*COSC, COSA*SINB*COSC+SINA*SINC,
+			SINA*COSB, SINA*SINB+COSA*COSC, SINA*SINB*COSC-COSA*SINC,
+			-SINB, COSB*SINC, COSB*COSC)
 
-@njit
+@njit(cache=True)
+def get_3D_rotn_matrix(a, b, c):
+	r00, r01, r02, r10, r11, r12, r20, r21, r22 = get_3D_rotn_(
+		np.cos(a), np.sin(a), np.cos(b), np.sin(b), np.cos(c), np.sin(c))
+	m = np.empty((3, 3))
+	m[0, 0] = r00
+	m[0, 1] = r01
+	m[0, 2] = r02
+	m[1, 0] = r10
+	m[1, 1] = r11
+	m[1, 2] = r12
+	m[2, 0] = r20
+	m[2, 1] = r21
+	m[2, 2] = r22
+	return m
+
+@njit(cache=True)
 def rotate_3D(p, a, b, c):
 	m = get_3D_rotn_matrix(a, b, c)
 	return m.dot(p)
 
-@njit
+@njit(cache=True)
 def rotate_3D_fast(p, m):
 	return m.dot(p)
 
-@njit
 def find_center_(vertices, n):
 	xs = vertices[:, 0]
 	ys = vertices[:, 1]
-	return np.array([np.sum(xs)/n, np.sum(ys)/n])
+	return np.sum(xs)/n, np.sum(ys)/n
 
-@njit
 def recenter_(vertices, n):
 	diffx, diffy = find_center_(vertices, n)
-	new = np.zeros_like(vertices)
-	for i in range(new.shape[0]):
-		vx, vy = vertices[i]
-		new[i, 0] = vx - diffx
-		new[i, 1] = vy - diffy
-	return new
+	return vertices - np.array([diffx, diffy])
 
-@njit
 def find_center(vertices):
 	xs = vertices[:, 0]
 	ys = vertices[:, 1]
 	minx, maxx, miny, maxy = (np.min(xs), np.max(xs), np.min(ys), np.max(ys))
-	return np.array([minx + (maxx - minx)/2, miny + (maxy - miny)/2])
+	return minx + (maxx - minx)/2, miny + (maxy - miny)/2
 
-@njit
 def re_center(vertices):
 	diffx, diffy = find_center(vertices)
-	new = np.zeros_like(vertices)
-	for i in range(len(vertices)):
-		vx, vy = vertices[i]
-		new[i, 0] = vx - diffx
-		new[i, 1] = vy - diffy
-	return new
+	return vertices - np.array([diffx, diffy])
 
-@njit
 def stack_center(vertices):
-	s = vertices.shape[0]
-	vs = np.zeros((s+1,2))
-	for i in range(s):
-		vs[i] = vertices[i]
-	vs[s] = np.array([0.,0.])
-	return vs
+	return np.vstack((vertices, np.zeros((1, 2))))
 
-@njit
 def stack_center_3D(vertices):
-	s = vertices.shape[0]
-	vs = np.zeros((s+1,3))
-	for i in range(s):
-		vs[i] = vertices[i]
-	vs[s] = np.array([0.,0.,0.])
-	return vs
-
-@njit
-def get_midpoint(p1, p2):
-	dx = (p1[0] - p2[0])/2
-	dy = (p1[1] - p2[1])/2
-	return np.array([dx+p2[0],dy+p2[1]])
+	return np.vstack((vertices, np.zeros((1, 3))))
 
-@njit
 def stack_midpoints(vertices):
 	s = vertices.shape[0]
-	s_ = (s*2)
-	vs = np.zeros((s_, 2))
-	for i in range(s_):
-		if i % 2 == 0:
-			vs[i] = vertices[int(i/2)]
-		else:
-			p1 = vertices[int((i-1)/2)]
-			p2 = vertices[int((i+1)/2)]
-			vs[i] = get_midpoint(p1, p2)
-	vs[s_-1] = get_midpoint(vertices[s-1], vertices[0])
+	vs = np.zeros((s*2, 2))
+	vs[0::2] = vertices
+	vs[1::2] = (vertices + np.roll(vertices, -1, axis=0))/2
 	return vs
 
 @njit
@@ -146,123 +117,128 @@ def add_to_axis(vs, n, ax):
 		v = vs[i]
 		v[ax] += n
 
-@njit
 def pad(ps):
-	s1, s2 = ps.shape
-	new = np.zeros((s1, s2+1))
-	for i in range(s1):
-		new[i] = np.append(ps[i], 0)
-	return new
+	s1, _ = ps.shape
+	return np.concatenate((ps, np.zeros((s1, 1))), axis=1)
+
+@functools.lru_cache(maxsize=256)
+def _get_polygon_cached(num, scale, recenter):
+	thetas = (2*PI / float(num))*np.arange(1, num)
+	pts = np.zeros((num, 2))
+	pts[1:, 0] = np.cumsum(scale*np.cos(thetas))
+	pts[1:, 1] = np.cumsum(scale*np.sin(thetas))
+	if recenter:
+		pts = recenter_(pts, num)
+	# The cached array is shared between callers; anyone who wants to
+	# mutate it has to copy first
+	pts.setflags(write=False)
+	return pts
 
-@njit
 def get_polygon(num, scale=1, recenter=True):
 	'''
 	Create a num-gon and return 2D array of pts of its vertices
 	'''
-	pts = np.zeros((num,2))
-	dtheta = 2*PI / float(num)
-	theta0 = 0
-	p0 = np.zeros(2)
-	pts[0] = p0
-	x = p0[0]
-	y = p0[1]
-	theta = theta0
-	for i in range(1, num):
-		theta += dtheta
-		dx = np.cos(theta)
-		dy = np.sin(theta)
-		x += scale*dx
-		y += scale*dy
-		pts[i] = np.array([x, y])
-	return recenter_(pts, num) if recenter else pts
+	return _get_polygon_cached(num, scale, recenter)
 
-@njit
 def get_prism(num=4, scale=1):
-	btm = pad(get_polygon(num))
-	top = pad(get_polygon(num))
-	add_to_axis(btm, -0.5, 2)
-	add_to_axis(top, 0.5, 2)
-	cube = np.zeros((num*2, 3))
-	for i in range(0, num):
-		cube[i] = btm[i]
-	for i in range(num, num*2):
-		cube[i] = top[i-num]
+	base = get_polygon(num)
+	cube = np.empty((num*2, 3))
+	cube[:num, :2] = base
+	cube[:num, 2] = -0.5
+	cube[num:, :2] = base
+	cube[num:, 2] = 0.5
 	return cube
 
-@njit
 def get_pyramid(num, doub=False, scale=1):
 	btm = get_polygon(num, scale=scale)
-	s = num + 1
-	if doub:
-		s += 1
+	s = num + 2 if doub else num + 1
 	pyr = np.zeros((s,3))
-	for i in range(s):
-		pyr[i] = np.array([btm[i,0], btm[i,1], 0.])
+	pyr[:num, :2] = btm
 	if doub:
 		pyr[s-2] = [0., 0., -0.5]
 		pyr[s-1] = [0., 0., 0.5]
 	else:
 		pyr[s-1] = [0., 0., 1.]
-		add_to_axis(pyr, -0.5, 2)
+		pyr[:, 2] -= 0.5
 	return pyr
 
-@njit
-def get_vertex(num, heap):
+@njit(inline='always')
+def get_vertex_(num, heap, head, ln, mask):
+	'''
+	Draws a vertex index satisfying the rule,
+	operating on the unpacked rule state and the
+	precomputed forbidden mask (see chaostech.Rule
+	free functions). Returns the index and the
+	updated ring head.
+	'''
 	cond = True
 	while cond:
 		vi = np.random.randint(num)
-		cond = heap.check(num, vi)
-	heap.add(vi)
-	return vi
+		cond = rule_check_mask(heap, head, ln, mask, vi)
+	head = rule_add(heap, head, ln, vi)
+	return vi, head
 
+@njit(inline='always')
+def get_vertex_table(num, heap, head, ln, aidx, acnt, u):
+	'''
+	Constrained vertex draw without rejection: when the heap is
+	uniform, one row lookup in the allowed-vertex table (see
+	chaostech.Rule.build_allowed_table) maps the uniform u straight
+	to a legal index; otherwise nothing is forbidden and u indexes
+	all vertices.
+	'''
+	if rule_all(heap, ln):
+		ref = rule_get(heap, head)
+		vi = aidx[ref, int(u*acnt[ref])]
+	else:
+		vi = int(u*num)
+	head = rule_add(heap, head, ln, vi)
+	return vi, head
 
 @njit
+def get_vertex(num, rule):
+	mask = build_forbidden_mask(num, rule.offset, rule.s, rule.symmetry)
+	vi, head = get_vertex_(num, rule.heap, rule.head, rule.ln, mask)
+	rule.head = head
+	return vi
+
+
+@njit(inline='always')
 def rotate(x, y, theta):
 	COS = np.cos(theta)
 	SIN = np.sin(theta)
-	return np.array([x*COS - y*SIN, x*SIN + y*COS])
+	return x*COS - y*SIN, x*SIN + y*COS
 
-@njit
+@njit(inline='always')
 def rotate_(x, y, COS, SIN):
-	return np.array([x*COS - y*SIN, x*SIN + y*COS])
+	return x*COS - y*SIN, x*SIN + y*COS
 
 
-@njit
+@njit(cache=True)
 def to_trig(T):
 	s = T.shape[0]
-	T_ = np.zeros((s, 3))
-	for i in range(s):
-		T_[i, 0] = T[i, 0]
-		theta = T[i, 1]
-		T_[i, 1] = np.cos(theta)
-		T_[i, 2] = np.sin(theta)
+	T_ = np.empty((s, 3))
+	T_[:, 0] = T[:, 0]
+	T_[:, 1] = np.cos(T[:, 1])
+	T_[:, 2] = np.sin(T[:, 1])
 	return T_
 
-@njit
 def to_array(T, lnv):
-	T_ = np.zeros((lnv, 2))
-	for i in range(lnv):
-		T_[i] = T
-	return T_
+	return np.tile(T, (lnv, 1))
 
 @njit
 def identity(x):
 	return x
 
-@njit
-def get_diffs(v, p, d):
-	diffs = np.zeros(d)
-	for i in range(d):
-		diffs[i] = v[i] - p[i]
-	return diffs
+@njit(inline='always')
+def get_diffs(v, px, py, pz):
+	return v[0] - px, v[1] - py, v[2] - pz
 
-@njit
-def get_next_3D(p, ds, k):
-	return np.array([ds[0]*k + p[0],
-					 ds[1]*k + p[1],
-					 ds[2]*k + p[2]])
+@njit(inline='always')
+def get_next_3D(px, py, pz, dx, dy, dz, k):
+	return dx*k + px, dy*k + py, dz*k + pz
 
-@njit
+@njit(nogil=True)
 def getPointsAdv_sequence(N, p, f, args, seq, modulo, iterator, seqiter):
 	'''
 	Fractal iterator where the selection of the vertex follows the given sequence.
@@ -284,8 +260,8 @@ def getPointsAdv_sequence(N, p, f, args, seq, modulo, iterator, seqiter):
 		seq = seqiter(seq,k,s_)
 	return pts
 
-@njit
-def getPointsAdv(N, p, f, args, chooser, selector, iterator, probs):
+@njit(nogil=True)
+def getPointsAdv(N, p, f, args, chooser, selector, iterator, probs, dtype=np.float32):
 	'''
 	Fractal iterator where almost the entire functionality is based on user input
 	(WORK IN PROGRESS, MAKES MORE SENSE WITH GUI [SEE _old_MainUI_.py]). The user
@@ -297,7 +273,7 @@ def getPointsAdv(N, p, f, args, chooser, selector, iterator, probs):
 	'f' is the function called on the current point and the parameters returned by
 	'selector'.
 	'''
-	pts = np.zeros((N, 3))
+	pts = np.zeros((N, 3), dtype)
 	pts[0] = p
 	for k in range(1, N):
 		i = chooser(probs)
@@ -307,8 +283,155 @@ def getPointsAdv(N, p, f, args, chooser, selector, iterator, probs):
 		params = iterator(params)
 	return pts
 
-@njit
-def getPointsV(vs, x0, y0, N, ifs, T, rule):
+@njit(cache=True, fastmath=True, boundscheck=False, nogil=True)
+def _getPointsV_norule(vs, x0, y0, N, T, dtype=np.float32):
+	'''
+	Fast path of getPointsV for the default (empty) rule. All vertex
+	indices are drawn in one batched call and the transformation table
+	is hoisted into three SoA arrays (k, cos, sin) so the loop is pure
+	scalar arithmetic with no per-iteration allocation.
+	'''
+	lnv = vs.shape[0]
+	lnt = T.shape[0]
+	Ks = np.ascontiguousarray(T[:, 0])
+	COSs = np.cos(T[:, 1])
+	SINs = np.sin(T[:, 1])
+	vis = np.random.randint(0, lnv, N).astype(np.int32)
+	tis = vis % lnt
+	# Pre-gather the per-step vertex and transform values into
+	# length-N streams: one vectorized gather up front, then the loop
+	# only does sequential reads the hardware prefetcher covers
+	vxs = np.ascontiguousarray(vs[:, 0])[vis]
+	vys = np.ascontiguousarray(vs[:, 1])[vis]
+	kss = Ks[tis]
+	css = COSs[tis]
+	sss = SINs[tis]
+	xs = np.zeros(N, dtype)
+	ys = np.zeros(N, dtype)
+	x = x0
+	y = y0
+	xs[0] = x
+	ys[0] = y
+	for i in range(1, N):
+		dx = vxs[i] - x
+		dy = vys[i] - y
+		c = css[i]
+		s = sss[i]
+		k = kss[i]
+		x += (dx*c - dy*s)*k
+		y += (dx*s + dy*c)*k
+		xs[i] = x
+		ys[i] = y
+	return xs, ys
+
+@njit(cache=True, fastmath=True, boundscheck=False, nogil=True)
+def ifs_run(A, B, C, D, E, F, prob, alias, x, y, xs, ys, us):
+	'''
+	Resumable affine IFS block. Advances the orbit from (x, y) by
+	len(xs) steps, writing into the caller's buffers, and returns the
+	final state along with the block's bounds. Callers can stream an
+	arbitrarily long orbit through a fixed tile without reallocating.
+	'us' supplies one uniform per step, drawn by the caller.
+	'''
+	n = xs.shape[0]
+	xmin = x
+	xmax = x
+	ymin = y
+	ymax = y
+	# Turn the uniforms into transform indices in a separate tight
+	# pass so the orbit loop reads them as a sequential stream
+	iis = np.empty(n, dtype=np.int32)
+	for k in range(n):
+		iis[k] = alias_draw_(prob, alias, us[k])
+	for k in range(n):
+		i = iis[k]
+		x, y = A[i]*x + B[i]*y + C[i], D[i]*x + E[i]*y + F[i]
+		xs[k] = x
+		ys[k] = y
+		xmin = min(xmin, x)
+		xmax = max(xmax, x)
+		ymin = min(ymin, y)
+		ymax = max(ymax, y)
+	return x, y, xmin, xmax, ymin, ymax
+
+def getPointsAdv_affine(N, x0, y0, A, B, C, D, E, F, prob, alias, dtype=np.float32):
+	'''
+	Specialized IFS iterator for affine maps with the six
+	coefficients stored as separate contiguous 1D arrays (SoA). Each
+	draw is six scalar loads at the same index -- no row gather, no
+	per-iteration array allocation and no function indirection.
+	Thin wrapper over the resumable ifs_run kernel; the uniforms come
+	from the module PCG64 generator, whose bulk fill is faster than
+	the legacy MT19937 the kernels would reach for internally.
+	'''
+	xs = np.zeros(N, dtype)
+	ys = np.zeros(N, dtype)
+	xs[0] = x0
+	ys[0] = y0
+	_, _, xmin, xmax, ymin, ymax = ifs_run(A, B, C, D, E, F,
+		prob, alias, x0, y0, xs[1:], ys[1:], _RNG.random(N - 1))
+	xmin = min(xmin, x0)
+	xmax = max(xmax, x0)
+	ymin = min(ymin, y0)
+	ymax = max(ymax, y0)
+	return xs, ys, xmin, xmax, ymin, ymax
+
+@njit(parallel=True, fastmath=True, boundscheck=False, nogil=True)
+def _getPointsAdv_affine_parallel(N, A, B, C, D, E, F, prob, alias,
+		nchunks, dtype):
+	'''
+	Runs nchunks independent affine IFS orbits and concatenates their
+	points. As with _getPointsV_parallel, only the invariant
+	distribution matters to the histogram plot, so chain order is
+	free. Affine maps can take a few hundred steps to fall onto the
+	attractor, so each chain discards a 500-step transient.
+	'''
+	chunk = N // nchunks
+	xs = np.zeros(N, dtype)
+	ys = np.zeros(N, dtype)
+	xmins = np.empty(nchunks)
+	xmaxs = np.empty(nchunks)
+	ymins = np.empty(nchunks)
+	ymaxs = np.empty(nchunks)
+	for c in prange(nchunks):
+		x = 0.
+		y = 0.
+		xmin = np.inf
+		xmax = -np.inf
+		ymin = np.inf
+		ymax = -np.inf
+		start = c*chunk
+		end = N if c == nchunks - 1 else start + chunk
+		us = np.random.random(end - start + 500)
+		for k in range(start - 500, end):
+			i = alias_draw_(prob, alias, us[k - start + 500])
+			x, y = A[i]*x + B[i]*y + C[i], D[i]*x + E[i]*y + F[i]
+			if k >= start:
+				xs[k] = x
+				ys[k] = y
+				xmin = min(xmin, x)
+				xmax = max(xmax, x)
+				ymin = min(ymin, y)
+				ymax = max(ymax, y)
+		xmins[c] = xmin
+		xmaxs[c] = xmax
+		ymins[c] = ymin
+		ymaxs[c] = ymax
+	return xs, ys, xmins.min(), xmaxs.max(), ymins.min(), ymaxs.max()
+
+def getPointsAdv_affine_parallel(N, A, B, C, D, E, F, prob, alias,
+		nchunks=None, dtype=np.float32):
+	'''
+	Parallel drop-in for getPointsAdv_affine. Defaults to one chain
+	per worker thread.
+	'''
+	if nchunks is None:
+		nchunks = get_num_threads()
+	return _getPointsAdv_affine_parallel(N, A, B, C, D, E, F, prob,
+		alias, nchunks, dtype)
+
+@njit(nogil=True)
+def getPointsV(vs, x0, y0, N, ifs, T, rule, dtype=np.float32):
 	'''
 	The classic fractal iterator. 'vs' is an array of vertices. 'x0' & 'y0' are the
 	initial conditions. 'N' is the number of iterations. 'ifs' is deprecated and
@@ -318,98 +441,410 @@ def getPointsV(vs, x0, y0, N, ifs, T, rule):
 	two vertices away from the previous vertex, etc.).
 
 	No iterator argument is present. If iterator needed, call 'getPointsV_iter'.
+
+	Returns the trajectory as two contiguous arrays (xs, ys).
 	'''
+	if rule.ln == 0:
+		return _getPointsV_norule(vs, x0, y0, N, T, dtype)
 	x = x0
 	y = y0
-	pts = np.zeros((N, 3))
+	xs = np.zeros(N, dtype)
+	ys = np.zeros(N, dtype)
 	lnv = vs.shape[0]
 	lnt = T.shape[0]
-	pts[0] = np.array([x,y,0])
+	xs[0] = x
+	ys[0] = y
 	#if check_v(ifs, T, lnv):  removed for modulo T accessing
 	T_ = to_trig(T)
+	# Unpack the rule state and precompute the
+	# forbidden mask once so the loop does no
+	# jitclass attribute access or modular math
+	r_heap, r_head, r_ln = rule.heap, rule.head, rule.ln
+	aidx, acnt = build_allowed_table(lnv, rule.offset, rule.s, rule.symmetry)
+	# One bulk RNG call beats a PRNG state touch per iteration, and
+	# the table needs exactly one uniform per point
+	us = np.random.random(N)
 	for i in range(1,N):
-		vi = get_vertex(lnv, rule)
+		vi, r_head = get_vertex_table(lnv, r_heap, r_head, r_ln, aidx, acnt, us[i])
 		v = vs[vi]
 		diffx = (v[0] - x)
 		diffy = (v[1] - y)
 		k, COS, SIN = T_[vi % lnt]
-		rot = rotate_(diffx, diffy, COS, SIN) #if do_rot else np.array([diffx, diffy])
-		x = rot[0]*k + x
-		y = rot[1]*k + y
-		pts[i, 0] = x
-		pts[i, 1] = y
-	return pts
-
-@njit
-def getPoints3D(vs, p0, N, ifs, T, R, rule, fk=identity):
+		rx, ry = rotate_(diffx, diffy, COS, SIN) #if do_rot else (diffx, diffy)
+		x = rx*k + x
+		y = ry*k + y
+		xs[i] = x
+		ys[i] = y
+	# Leave the rule object consistent for reuse across calls
+	rule.head = r_head
+	return xs, ys
+
+@njit(nogil=True)
+def _getPoints3D_nofk(vs, p0, N, ifs, T, R, rule, dtype):
 	'''
-	Similar to getPointsV but in 3D. However, an iterator 'fk' can be passed to iterate
-	k (the compression value).
+	getPoints3D specialized for the identity k-iterator: no callback
+	per iteration, no write-back into T, and the rotation matrix
+	entries hoisted to scalars.
 	'''
-	p = p0
-	pts = np.zeros((N, 3))
+	px, py, pz = p0[0], p0[1], p0[2]
+	pts = np.zeros((N, 3), dtype)
 	lnv = vs.shape[0]
 	lnt = T.shape[0]
+	r00, r01, r02 = R[0, 0], R[0, 1], R[0, 2]
+	r10, r11, r12 = R[1, 0], R[1, 1], R[1, 2]
+	r20, r21, r22 = R[2, 0], R[2, 1], R[2, 2]
+	r_heap, r_head, r_ln = rule.heap, rule.head, rule.ln
+	aidx, acnt = build_allowed_table(lnv, rule.offset, rule.s, rule.symmetry)
+	us = np.random.random(N)
 	for i in range(1,N):
-		vi = get_vertex(lnv, rule)
+		vi, r_head = get_vertex_table(lnv, r_heap, r_head, r_ln, aidx, acnt, us[i])
 		v = vs[vi]
-		diffs = R.dot(get_diffs(v, p, 3))
+		dx, dy, dz = get_diffs(v, px, py, pz)
+		rx = r00*dx + r01*dy + r02*dz
+		ry = r10*dx + r11*dy + r12*dz
+		rz = r20*dx + r21*dy + r22*dz
+		k = T[vi % lnt, 0]
+		px, py, pz = get_next_3D(px, py, pz, rx, ry, rz, k)
+		pts[i, 0] = px
+		pts[i, 1] = py
+		pts[i, 2] = pz
+	rule.head = r_head
+	return pts
+
+@njit(nogil=True)
+def _getPoints3D(vs, p0, N, ifs, T, R, rule, fk, dtype):
+	px, py, pz = p0[0], p0[1], p0[2]
+	pts = np.zeros((N, 3), dtype)
+	lnv = vs.shape[0]
+	lnt = T.shape[0]
+	# Unpack the rule state and precompute the
+	# forbidden mask once so the loop does no
+	# jitclass attribute access or modular math
+	r_heap, r_head, r_ln = rule.heap, rule.head, rule.ln
+	r_mask = build_forbidden_mask(lnv, rule.offset, rule.s, rule.symmetry)
+	for i in range(1,N):
+		vi, r_head = get_vertex_(lnv, r_heap, r_head, r_ln, r_mask)
+		v = vs[vi]
+		dx, dy, dz = get_diffs(v, px, py, pz)
+		rx = R[0,0]*dx + R[0,1]*dy + R[0,2]*dz
+		ry = R[1,0]*dx + R[1,1]*dy + R[1,2]*dz
+		rz = R[2,0]*dx + R[2,1]*dy + R[2,2]*dz
 		k, _ = T[vi % lnt]
-		p = get_next_3D(p, diffs, k)
+		px, py, pz = get_next_3D(px, py, pz, rx, ry, rz, k)
 		T[vi % lnt, 0] = fk(k) 
-		pts[i] = p
+		pts[i, 0] = px
+		pts[i, 1] = py
+		pts[i, 2] = pz
+	rule.head = r_head
 	return pts
 
-@njit
-def getPoints3D_iter_thetas(vs, p0, N, ifs, T, thetas, rule, fk=identity, fa=identity,
-	fb=identity, fc=identity):
+def getPoints3D(vs, p0, N, ifs, T, R, rule, fk=identity, dtype=np.float32):
 	'''
-	Similar to getPoints3D but also allows for passing iterators for yaw, pitch and roll
+	Similar to getPointsV but in 3D. However, an iterator 'fk' can be passed to iterate
+	k (the compression value). The default identity iterator routes to
+	a specialized kernel with no callback in the loop.
 	'''
+	if fk is identity:
+		return _getPoints3D_nofk(vs, p0, N, ifs, T, R, rule, dtype)
+	return _getPoints3D(vs, p0, N, ifs, T, R, rule, fk, dtype)
+
+@njit(nogil=True)
+def _getPoints3D_iter_thetas(vs, p0, N, ifs, T, thetas, rule, fk, fa,
+	fb, fc, dtype):
 	a, b, c = thetas
-	p = p0
-	pts = np.zeros((N, 3))
+	px, py, pz = p0[0], p0[1], p0[2]
+	pts = np.zeros((N, 3), dtype)
 	lnv = vs.shape[0]
 	lnt = T.shape[0]
+	# Rotation matrix entries live as nine scalars and
+	# are only rebuilt when an iterator actually moves
+	# the angles; for identity iterators the trig is
+	# hoisted out of the loop entirely
+	r00, r01, r02, r10, r11, r12, r20, r21, r22 = get_3D_rotn_(
+		np.cos(a), np.sin(a), np.cos(b), np.sin(b), np.cos(c), np.sin(c))
+	# Unpack the rule state and precompute the
+	# forbidden mask once so the loop does no
+	# jitclass attribute access or modular math
+	r_heap, r_head, r_ln = rule.heap, rule.head, rule.ln
+	r_mask = build_forbidden_mask(lnv, rule.offset, rule.s, rule.symmetry)
 	for i in range(1,N):
-		vi = get_vertex(lnv, rule)
+		vi, r_head = get_vertex_(lnv, r_heap, r_head, r_ln, r_mask)
 		v = vs[vi]
-		diffs = rotate_3D(get_diffs(v, p, 3), a, b, c)
+		dx, dy, dz = get_diffs(v, px, py, pz)
+		rx = r00*dx + r01*dy + r02*dz
+		ry = r10*dx + r11*dy + r12*dz
+		rz = r20*dx + r21*dy + r22*dz
 		k, _ = T[vi % lnt]
-		p = get_next_3D(p, diffs, k)
+		px, py, pz = get_next_3D(px, py, pz, rx, ry, rz, k)
 		T[vi % lnt, 0] = fk(k) 
-		a = fa(a)
-		b = fb(b)
-		c = fc(c)
-		pts[i] = p
+		na = fa(a)
+		nb = fb(b)
+		nc = fc(c)
+		if na != a or nb != b or nc != c:
+			a, b, c = na, nb, nc
+			r00, r01, r02, r10, r11, r12, r20, r21, r22 = get_3D_rotn_(
+				np.cos(a), np.sin(a), np.cos(b), np.sin(b), np.cos(c), np.sin(c))
+		pts[i, 0] = px
+		pts[i, 1] = py
+		pts[i, 2] = pz
+	rule.head = r_head
 	return pts
 
+def getPoints3D_iter_thetas(vs, p0, N, ifs, T, thetas, rule, fk=identity, fa=identity,
+	fb=identity, fc=identity, dtype=np.float32):
+	'''
+	Similar to getPoints3D but also allows for passing iterators for yaw, pitch and roll.
+	When no angle iterator is given the rotation is constant, so this
+	collapses to getPoints3D with the matrix built once.
+	'''
+	if fa is identity and fb is identity and fc is identity:
+		a, b, c = thetas
+		R = get_3D_rotn_matrix(a, b, c)
+		return getPoints3D(vs, p0, N, ifs, T, R, rule, fk, dtype)
+	return _getPoints3D_iter_thetas(vs, p0, N, ifs, T, thetas, rule,
+		fk, fa, fb, fc, dtype)
+
 
-@njit
-def getPointsV_iter(vs, x0, y0, N, ifs, T, rule, fk=identity, ft=identity):
+@njit(parallel=True, fastmath=True, boundscheck=False, nogil=True)
+def _getPointsV_parallel(vs, N, T, ln, offset, s, symmetry, nchunks, dtype):
+	'''
+	Runs nchunks independent chaos-game chains and concatenates their
+	points. The trajectory order differs from the sequential kernel,
+	but the datashader plot only histograms the points, so only the
+	invariant distribution matters. Each chain gets its own rule heap
+	and discards a short warm-up to land on the attractor first.
+	'''
+	lnv = vs.shape[0]
+	lnt = T.shape[0]
+	T_ = to_trig(T)
+	aidx, acnt = build_allowed_table(lnv, offset, s, symmetry)
+	chunk = N // nchunks
+	xs = np.zeros(N, dtype)
+	ys = np.zeros(N, dtype)
+	xmins = np.empty(nchunks)
+	xmaxs = np.empty(nchunks)
+	ymins = np.empty(nchunks)
+	ymaxs = np.empty(nchunks)
+	for c in prange(nchunks):
+		heap = get_heap(ln)
+		head = 0
+		x = 0.
+		y = 0.
+		xmin = np.inf
+		xmax = -np.inf
+		ymin = np.inf
+		ymax = -np.inf
+		start = c*chunk
+		end = N if c == nchunks - 1 else start + chunk
+		us = np.random.random(end - start + 50)
+		for i in range(start - 50, end):
+			vi, head = get_vertex_table(lnv, heap, head, ln, aidx, acnt, us[i - start + 50])
+			v = vs[vi]
+			diffx = (v[0] - x)
+			diffy = (v[1] - y)
+			k, COS, SIN = T_[vi % lnt]
+			rx, ry = rotate_(diffx, diffy, COS, SIN)
+			x = rx*k + x
+			y = ry*k + y
+			if i >= start:
+				xs[i] = x
+				ys[i] = y
+				xmin = min(xmin, x)
+				xmax = max(xmax, x)
+				ymin = min(ymin, y)
+				ymax = max(ymax, y)
+		xmins[c] = xmin
+		xmaxs[c] = xmax
+		ymins[c] = ymin
+		ymaxs[c] = ymax
+	return xs, ys, xmins.min(), xmaxs.max(), ymins.min(), ymaxs.max()
+
+def getPointsV_parallel(vs, N, T, rule, nchunks=None, dtype=np.float32):
+	'''
+	Parallel drop-in for getPointsV when only the point distribution
+	is needed (e.g. the fast datashader plot). Defaults to one chain
+	per worker thread.
+	'''
+	if nchunks is None:
+		nchunks = get_num_threads()
+	return _getPointsV_parallel(vs, N, T, rule.ln, rule.offset,
+		rule.s, rule.symmetry, nchunks, dtype)
+
+
+@njit(parallel=True, fastmath=True, boundscheck=False, nogil=True)
+def _bin_chaos_game(vs, N, T, ln, offset, s, symmetry, x0, y0, x1, y1, W, H, nchunks):
 	'''
-	Similar to getPointsV but iterator functions can be passed on k and theta
+	Chaos game fused with histogram binning: runs nchunks independent
+	chains and accumulates straight into per-chain (H, W) count
+	grids, reduced at the end. No (N, 3) trajectory buffer is ever
+	materialized, so memory traffic is the size of the canvas rather
+	than the point count.
 	'''
+	lnv = vs.shape[0]
+	lnt = T.shape[0]
+	T_ = to_trig(T)
+	aidx, acnt = build_allowed_table(lnv, offset, s, symmetry)
+	hists = np.zeros((nchunks, H, W), dtype=np.int32)
+	chunk = N // nchunks
+	sx = W/(x1 - x0)
+	sy = H/(y1 - y0)
+	for c in prange(nchunks):
+		heap = get_heap(ln)
+		head = 0
+		x = 0.
+		y = 0.
+		n = N - chunk*(nchunks - 1) if c == nchunks - 1 else chunk
+		us = np.random.random(n + 50)
+		for i in range(-50, n):
+			vi, head = get_vertex_table(lnv, heap, head, ln, aidx, acnt, us[i + 50])
+			v = vs[vi]
+			diffx = (v[0] - x)
+			diffy = (v[1] - y)
+			k, COS, SIN = T_[vi % lnt]
+			rx, ry = rotate_(diffx, diffy, COS, SIN)
+			x = rx*k + x
+			y = ry*k + y
+			if i >= 0:
+				ix = int((x - x0)*sx)
+				iy = int((y - y0)*sy)
+				if 0 <= ix < W and 0 <= iy < H:
+					hists[c, iy, ix] += 1
+	hist = np.zeros((H, W), dtype=np.int32)
+	for c in range(nchunks):
+		hist += hists[c]
+	return hist
+
+def bin_chaos_game(vs, T, N, rule, bounds, W=1500, H=1500, nchunks=None):
+	'''
+	Histogram of N chaos-game points on a W x H canvas over
+	bounds = (x0, x1, y0, y1), for feeding straight into a shader.
+	'''
+	if nchunks is None:
+		nchunks = get_num_threads()
+	x0, x1, y0, y1 = bounds
+	return _bin_chaos_game(vs, N, T, rule.ln, rule.offset, rule.s,
+		rule.symmetry, x0, y0, x1, y1, W, H, nchunks)
+
+@njit(parallel=True, fastmath=True, boundscheck=False, nogil=True)
+def _hist2d(xs, ys, x0, x1, y0, y1, W, H, nchunks):
+	'''
+	Parallel 2D histogram of already-generated points: each worker
+	bins its slice into a private (H, W) grid, reduced at the end, so
+	there is no atomic contention on hot pixels.
+	'''
+	n = xs.shape[0]
+	hists = np.zeros((nchunks, H, W), dtype=np.int32)
+	chunk = n // nchunks
+	sx = W/(x1 - x0)
+	sy = H/(y1 - y0)
+	for c in prange(nchunks):
+		start = c*chunk
+		end = n if c == nchunks - 1 else start + chunk
+		for i in range(start, end):
+			ix = int((xs[i] - x0)*sx)
+			iy = int((ys[i] - y0)*sy)
+			if 0 <= ix < W and 0 <= iy < H:
+				hists[c, iy, ix] += 1
+	hist = np.zeros((H, W), dtype=np.int32)
+	for c in range(nchunks):
+		hist += hists[c]
+	return hist
+
+def hist2d(xs, ys, bounds, W=1500, H=1500, nchunks=None):
+	'''
+	Histogram of the points on a W x H canvas over
+	bounds = (x0, x1, y0, y1), for feeding straight into a shader.
+	Replaces the datashader Canvas.points aggregation, which walks the
+	points single-threaded through a DataFrame.
+	'''
+	if nchunks is None:
+		nchunks = get_num_threads()
+	x0, x1, y0, y1 = bounds
+	return _hist2d(xs, ys, x0, x1, y0, y1, W, H, nchunks)
+
+@njit(parallel=True, fastmath=True, boundscheck=False, nogil=True)
+def _bin_ifs(A, B, C, D, E, F, prob, alias, N, x0, y0, x1, y1, W, H, nchunks):
+	'''
+	Affine IFS fused with histogram binning, the getPointsAdv_affine
+	twin of _bin_chaos_game: nchunks independent orbits accumulate
+	straight into per-chain (H, W) count grids, reduced at the end.
+	Each orbit discards a 500-step transient, and peak memory is the
+	canvas rather than the point count.
+	'''
+	hists = np.zeros((nchunks, H, W), dtype=np.int32)
+	chunk = N // nchunks
+	sx = W/(x1 - x0)
+	sy = H/(y1 - y0)
+	for c in prange(nchunks):
+		x = 0.
+		y = 0.
+		n = N - chunk*(nchunks - 1) if c == nchunks - 1 else chunk
+		us = np.random.random(n + 500)
+		for k in range(-500, n):
+			i = alias_draw_(prob, alias, us[k + 500])
+			x, y = A[i]*x + B[i]*y + C[i], D[i]*x + E[i]*y + F[i]
+			if k >= 0:
+				ix = int((x - x0)*sx)
+				iy = int((y - y0)*sy)
+				if 0 <= ix < W and 0 <= iy < H:
+					hists[c, iy, ix] += 1
+	hist = np.zeros((H, W), dtype=np.int32)
+	for c in range(nchunks):
+		hist += hists[c]
+	return hist
+
+def bin_ifs(A, B, C, D, E, F, prob, alias, N, bounds, W=1500, H=1500, nchunks=None):
+	'''
+	Histogram of N affine IFS points on a W x H canvas over
+	bounds = (x0, x1, y0, y1), for feeding straight into a shader.
+	'''
+	if nchunks is None:
+		nchunks = get_num_threads()
+	x0, x1, y0, y1 = bounds
+	return _bin_ifs(A, B, C, D, E, F, prob, alias, N, x0, y0, x1, y1,
+		W, H, nchunks)
+
+
+@njit(nogil=True)
+def _getPointsV_iter(vs, x0, y0, N, ifs, T, rule, fk, ft, dtype):
 	x = x0
 	y = y0
-	pts = np.zeros((N, 3))
+	xs = np.zeros(N, dtype)
+	ys = np.zeros(N, dtype)
 	lnv = vs.shape[0]
 	lnt = T.shape[0]
-	pts[0] = np.array([x,y,0])
+	xs[0] = x
+	ys[0] = y
+	# Unpack the rule state and precompute the
+	# forbidden mask once so the loop does no
+	# jitclass attribute access or modular math
+	r_heap, r_head, r_ln = rule.heap, rule.head, rule.ln
+	r_mask = build_forbidden_mask(lnv, rule.offset, rule.s, rule.symmetry)
 	for i in range(1,N):
-		vi = get_vertex(lnv, rule)
+		vi, r_head = get_vertex_(lnv, r_heap, r_head, r_ln, r_mask)
 		v = vs[vi]
 		diffx = (v[0] - x)
 		diffy = (v[1] - y)
 		k, theta = T[vi % lnt]
-		rot = rotate(diffx, diffy, theta)
-		x = rot[0]*k + x
-		y = rot[1]*k + y
+		rx, ry = rotate(diffx, diffy, theta)
+		x = rx*k + x
+		y = ry*k + y
 		T[vi % lnt, 0] = fk(k)
 		T[vi % lnt, 1] = ft(theta)
-		pts[i, 0] = x
-		pts[i, 1] = y
-	return pts
+		xs[i] = x
+		ys[i] = y
+	rule.head = r_head
+	return xs, ys
+
+def getPointsV_iter(vs, x0, y0, N, ifs, T, rule, fk=identity, ft=identity, dtype=np.float32):
+	'''
+	Similar to getPointsV but iterator functions can be passed on k and theta.
+	With both iterators left as the identity the transformations never
+	change, so this is just getPointsV.
+	'''
+	if fk is identity and ft is identity:
+		return getPointsV(vs, x0, y0, N, ifs, T, rule, dtype)
+	return _getPointsV_iter(vs, x0, y0, N, ifs, T, rule, fk, ft, dtype)
 
 
 @njit
@@ -429,7 +864,6 @@ def no_rule():
 ####### THESE \/ \/ MAY STILL WORK (NOT SURE) #####
 ### BUT 'ifs' enum (Order.vertex, etc.) is kinda useless
 
-@njit
 def sierpt(N, T=np.array([0.5, 0])):
 	vs = get_polygon(3, 1, True)
 	heap = no_rule()
@@ -437,7 +871,6 @@ def sierpt(N, T=np.array([0.5, 0])):
 	T = to_array(T, vs.shape[0])
 	return getPointsV(vs, 0, 0, N, ifs, T, heap)
 
-@njit
 def sierpc(N, T=np.array([2/3, 0])):
 	vs = get_polygon(4, 1, True)
 	vs = stack_midpoints(vs)
@@ -446,7 +879,6 @@ def sierpc(N, T=np.array([2/3, 0])):
 	T = to_array(T, vs.shape[0])
 	return getPointsV(vs, 0, 0, N, ifs, T, heap)
 
-@njit
 def vicsek(N, T=np.array([2/3, 0])):
 	vs = get_polygon(4, 1, True)
 	vs = stack_center(vs)
@@ -455,7 +887,6 @@ def vicsek(N, T=np.array([2/3, 0])):
 	T = to_array(T, vs.shape[0])
 	return getPointsV(vs, 0, 0, N, ifs, T, heap)
 
-@njit
 def tsquare(N, T=np.array([1/2, 0])):
 	vs = get_polygon(4, 1, True)
 	heap = Rule(1, 2, False)
@@ -463,7 +894,6 @@ def tsquare(N, T=np.array([1/2, 0])):
 	T = to_array(T, vs.shape[0])
 	return getPointsV(vs, 0, 0, N, ifs, T, heap)
 
-@njit
 def techs(N, T=np.array([1/2, 0]), skew=0):
 	vs = get_polygon(4, 1, True)
 	heap = Rule(1, skew, False)
@@ -471,7 +901,6 @@ def techs(N, T=np.array([1/2, 0]), skew=0):
 	T = to_array(T, vs.shape[0])
 	return getPointsV(vs, 0, 0, N, ifs, T, heap)
 
-@njit
 def webs(N, T=np.array([1/2, 0.1]), symmetry=True):
 	vs = get_polygon(4, 1, True)
 	heap = Rule(2, -1, symmetry)
@@ -479,5 +908,26 @@ def webs(N, T=np.array([1/2, 0.1]), symmetry=True):
 	T = to_array(T, vs.shape[0])
 	return getPointsV(vs, 0, 0, N, ifs, T, heap)
 
-
-
+def warmup():
+	'''
+	Run every hot kernel once on tiny inputs. The cache=True kernels
+	load from the on-disk cache and the parallel ones (which numba
+	cannot cache) compile here, so the first real plot never pays the
+	JIT stall. Meant to run in a background thread at server start.
+	'''
+	vs = get_polygon(3, 1, True)
+	T = to_array(np.array([0.5, 0.]), vs.shape[0])
+	bounds = (-2., 2., -2., 2.)
+	getPointsV(vs, 0., 0., 64, None, T, no_rule())
+	getPointsV(vs, 0., 0., 64, None, T, Rule(1, 0, False))
+	getPointsV_parallel(vs, 256, T, no_rule(), nchunks=2)
+	bin_chaos_game(vs, T, 256, no_rule(), bounds, W=8, H=8, nchunks=2)
+	coeff = np.full(2, 0.5, dtype=np.float32)
+	prob, alias = build_alias(np.full(2, 0.5))
+	xs, ys, _, _, _, _ = getPointsAdv_affine(64, 0., 0., coeff, coeff,
+		coeff, coeff, coeff, coeff, prob, alias)
+	hist2d(xs, ys, bounds, W=8, H=8, nchunks=2)
+	getPointsAdv_affine_parallel(256, coeff, coeff, coeff, coeff,
+		coeff, coeff, prob, alias, nchunks=2)
+	bin_ifs(coeff, coeff, coeff, coeff, coeff, coeff, prob, alias,
+		256, bounds, W=8, H=8, nchunks=2)
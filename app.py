@@ -3,6 +3,7 @@ from chaostech.Rule import *
 import components
 import transform_components as trc
 import chaostech.MathTech as mtec
+import chaostech.gpu as gpu
 import finder_components as fic
 import ChaosFinder as cfind
 
@@ -15,6 +16,7 @@ from dash.dependencies import Input, Output, State
 from dash.exceptions import PreventUpdate
 
 import datashader as ds
+import xarray as xr
 import matplotlib.pyplot as plt
 import plotly.express as px 
 import plotly.graph_objects as go
@@ -23,11 +25,19 @@ import pandas as pd
 import numpy as np
 from numba import njit
 import scipy
+import base64
 import math
 import sys
+import os
+import concurrent.futures
 
 
 #GLOBAL VARIABLES
+# The jitted kernels release the GIL, so heavy runs go through this
+# pool and other callbacks stay responsive while they crunch
+EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count())
+# Compile the kernels off the request path, at server start
+EXECUTOR.submit(f.warmup)
 fast_prev_pts = None
 fast_prev_N = math.inf
 prev_was_fast = False
@@ -50,22 +60,22 @@ def set_fast_globals(new_N, new_pts):
 	prev_was_fast = True
 
 def raw_figure(preset=None, poly=3, jump=0.5, N=10000, heap = None):
-	if preset : pts = preset(N)
+	if preset : xs, ys = preset(N)
 	else :
 		T = np.array([jump, 0])
 		vs = f.get_polygon(poly, 1, True)
 		if not heap: heap = f.no_rule()
 		T = f.to_array(T, vs.shape[0])
-		pts = f.getPointsV(vs, 0., 0., N, None, T, heap)
+		xs, ys = f.getPointsV(vs, 0., 0., N, None, T, heap)
 
 	poly = f.get_polygon(poly,1,True)
-	pts = pd.DataFrame(pts[:,:2], columns = ['x','y'])
+	pts = pd.DataFrame({'x': xs, 'y': ys}, copy=False)
 	pts["type"] = "iter"
 	pts["size"] = ITER_PT_SIZE
 	poly = pd.DataFrame(poly, columns = ['x','y'])
 	poly["type"] = "poly"
 	poly["size"] = POLY_PT_SIZE
-	pts = pts.append(poly)
+	pts = pd.concat((pts, poly), copy=False)
 	fig = px.scatter(pts,'x','y',color="type",size = "size", template = 'plotly_dark',color_discrete_sequence=px.colors.qualitative.Set3)
 	fig.update_traces(marker=dict(opacity = 1, line=dict(width=1, color='DarkSlateGray')))
 	fig.update_xaxes(showgrid=False,zeroline=False,visible=False)
@@ -87,8 +97,8 @@ def update_fig(p):
 	T = f.to_array(T, vs.shape[0])
 	heap = Rule(p["ln"],p["offset"],p["sym"])
 
-	pts = f.getPointsV(vs, 0, 0, p["N"], None, T, heap)
-	pts = pd.DataFrame(pts[:,:2],columns = ['x','y'])
+	xs, ys = f.getPointsV(vs, 0, 0, p["N"], None, T, heap)
+	pts = pd.DataFrame({'x': xs, 'y': ys}, copy=False)
 	pts["type"] = "iter"
 	pts["size"] = ITER_PT_SIZE
 	vs = pd.DataFrame(vs, columns = ['x','y'])
@@ -120,8 +130,8 @@ def iterations_callback(p):
 		x0 = oldfig['data'][0]['x'][oldN-1]
 		y0 = oldfig['data'][0]['y'][oldN-1]
 		N = N-oldN
-		pts = f.getPointsV(vs, x0, y0, N+1, None, T, heap)
-		pts = pd.DataFrame(pts[:,:2],columns = ['x','y'])
+		xs, ys = f.getPointsV(vs, x0, y0, N+1, None, T, heap)
+		pts = pd.DataFrame({'x': xs, 'y': ys}, copy=False)
 		pts["type"] = "iter"
 		pts["size"] = ITER_PT_SIZE
 		#append new iterations to old ones
@@ -155,34 +165,59 @@ def fast_plot_chaos_game(p, need_full_update):
 	heap = Rule(p["ln"],p["offset"],p["sym"])
 	T = f.to_array(T, vs.shape[0])
 	if prev_was_fast and not need_full_update:
+		xs_prev, ys_prev = fast_prev_pts
 		if N > fast_prev_N:
 			try:
-				x0,y0,_ = fast_prev_pts[fast_prev_N-1]
+				x0, y0 = xs_prev[fast_prev_N-1], ys_prev[fast_prev_N-1]
 			except IndexError:
 				try:
-					x0,y0,_ = fast_prev_pts[fast_prev_N-2]
+					x0, y0 = xs_prev[fast_prev_N-2], ys_prev[fast_prev_N-2]
 				except IndexError:
-					x0,y0,_ = fast_prev_pts[fast_prev_N-1001]
+					x0, y0 = xs_prev[fast_prev_N-1001], ys_prev[fast_prev_N-1001]
 			N_new = N - fast_prev_N
-			pts = f.getPointsV(vs, x0, y0, N_new+1, None, T, heap)[1:]
-			pts = np.append(fast_prev_pts, pts, axis=0)
+			xs_new, ys_new = f.getPointsV(vs, x0, y0, N_new+1, None, T, heap)
+			xs = np.concatenate((xs_prev, xs_new[1:]))
+			ys = np.concatenate((ys_prev, ys_new[1:]))
 		elif N < fast_prev_N:
-			pts = fast_prev_pts[:N-1]
+			xs = xs_prev[:N-1]
+			ys = ys_prev[:N-1]
 		else:
 			raise PreventUpdate
 	else:
-		pts = f.getPointsV(vs, 0., 0., N, None, T, heap)
-	df = pd.DataFrame(data=pts[:,:2], columns=["x", "y"])
-	xbounds = (pts[:, 0].min()-0.2, pts[:, 0].max()+0.2)
-	ybounds = (pts[:, 1].min()-0.2, pts[:, 1].max()+0.2)
-	cvs = ds.Canvas(plot_width=1500, plot_height=1500, x_range=xbounds, y_range=ybounds)
-	agg = cvs.points(df, 'x', 'y')
+		if N > 500000:
+			# Scout the attractor bounds on a short run, then bin the
+			# full run straight into the canvas -- no trajectory buffer
+			sxs, sys = f.getPointsV(vs, 0., 0., 10000, None, T, heap)
+			xbounds = (sxs.min()-0.2, sxs.max()+0.2)
+			ybounds = (sys.min()-0.2, sys.max()+0.2)
+			bounds = (xbounds[0], xbounds[1], ybounds[0], ybounds[1])
+			if gpu.HAS_CUDA and heap.ln == 0:
+				hist = gpu.bin_chaos_game_gpu(vs, T, N, bounds)
+			else:
+				hist = EXECUTOR.submit(f.bin_chaos_game, vs, T, N, heap, bounds).result()
+			agg = xr.DataArray(hist,
+				coords=[('y', np.linspace(*ybounds, 1500)),
+						('x', np.linspace(*xbounds, 1500))])
+			img = ds.tf.set_background(ds.tf.shade(agg, how="log", cmap=cc.fire), "black").to_pil()
+			fig = px.imshow(img)
+			fig.update_layout(paper_bgcolor='rgb(0,0,0)',plot_bgcolor='rgb(0,0,0)',xaxis_zeroline=False, yaxis_zeroline=False)
+			fig.update_xaxes(showticklabels=False,showgrid=False)
+			fig.update_yaxes(showticklabels=False,showgrid=False)
+			reset_fast_globals()
+			return fig
+		xs, ys = EXECUTOR.submit(f.getPointsV, vs, 0., 0., N, None, T, heap).result()
+	xbounds = (xs.min()-0.2, xs.max()+0.2)
+	ybounds = (ys.min()-0.2, ys.max()+0.2)
+	hist = f.hist2d(xs, ys, (xbounds[0], xbounds[1], ybounds[0], ybounds[1]))
+	agg = xr.DataArray(hist,
+		coords=[('y', np.linspace(*ybounds, 1500)),
+				('x', np.linspace(*xbounds, 1500))])
 	img = ds.tf.set_background(ds.tf.shade(agg, how="log", cmap=cc.fire), "black").to_pil()
 	fig = px.imshow(img)
 	fig.update_layout(paper_bgcolor='rgb(0,0,0)',plot_bgcolor='rgb(0,0,0)',xaxis_zeroline=False, yaxis_zeroline=False)
 	fig.update_xaxes(showticklabels=False,showgrid=False)
 	fig.update_yaxes(showticklabels=False,showgrid=False)
-	set_fast_globals(N, pts)
+	set_fast_globals(N, (xs, ys))
 	return fig
 
 
@@ -337,25 +372,13 @@ def update_presets(value, poly, jump, N, ln, offset, sym, midpoints, center):
 	prevent_initial_call=False
 	)
 def load_preset(value):
-	if value == 'MB_LIKE':
-		return trc.MB_LIKE, trc.MB_LIKE_PROBS, 'regular'
-	elif value == 'SPIRAL':
-		return trc.SPIRAL, trc.SPIRAL_PROBS, 'borke'
-	elif value == 'DRAGON':
-		return trc.DRAGON, trc.DRAGON_PROBS, 'borke'
-	elif value == 'XMAS':
-		return trc.XMAS, trc.XMAS_PROBS, 'borke'
-	elif value == 'FERN':
-		return trc.FERN, trc.FERN_PROBS, 'borke'
-	elif value == 'LEAF':
-		return trc.LEAF, trc.LEAF_PROBS, 'borke'
-	elif value == 'SIERPT':
-		return trc.SIERPT, trc.SIERPT_PROBS, 'regular'
-	else:
+	try:
+		return trc.PRESETS[value]
+	except KeyError:
 		raise PreventUpdate
 
 
-@app.callback(Output('GRAPH2', 'figure'),
+@app.callback(Output('GRAPH2', 'src'),
 	Input('plot-button', 'n_clicks'),
 	State('args-txt', 'value'),
 	State('probs-txt', 'value'),
@@ -365,46 +388,46 @@ def load_preset(value):
 	prevent_initial_call=False)
 def draw_ifs(_, args, probs, parse, N, color):
 	if args == None or probs == None:raise PreventUpdate
-	params = np.array(trc.read_args_from_string(args))
+	params = trc.read_args_from_string(args, parse)
 	probs = trc.read_probs_from_string(probs)
-	chooser = njit(lambda _: mtec.random_choice_fix(len(params), probs))
-	selector = njit(lambda a,i: a[i])
-	iterator = njit(lambda x: x)
-
-	if parse == 'regular':
-		@njit
-		def jump(args, x, y, z):
-			a,b,c,d,e,f = args
-			x_ = a*x + b*y + c
-			y_ = d*x + e*y + f
-			return np.array([x_,y_,z])
-	else :
-		@njit
-		def jump(args, x, y, z):
-			a,b,c,d,e,f = args
-			x_ = a*x + b*y + e
-			y_ = c*x + d*y + f
-			return np.array([x_,y_,z])
+	prob, alias = mtec.build_alias(np.asarray(probs, dtype=np.float64))
+	A, B, C, D, E, F = trc.unpack_ifs(params)
 
 	if color != None:
 		cmap = eval(color)
 	else:
 		cmap = cc.fire
 
-	p0 = np.array([0.,0.,0.])
 	N = N * 1000
-	pts = f.getPointsAdv(N, p0, jump, params, chooser, selector, iterator, probs)
-	df = pd.DataFrame(data=pts[:,:2], columns=["x", "y"])
-	xbounds = (pts[:, 0].min()-0.2, pts[:, 0].max()+0.2)
-	ybounds = (pts[:, 1].min()-0.2, pts[:, 1].max()+0.2)
-	cvs = ds.Canvas(plot_width=1500, plot_height=1500, x_range=xbounds, y_range=ybounds)
-	agg = cvs.points(df, 'x', 'y')
-	img = ds.tf.set_background(ds.tf.shade(agg, how="log", cmap=cmap), "black").to_pil()
-	fig = px.imshow(img)
-	fig.update_layout(paper_bgcolor='rgb(0,0,0)',plot_bgcolor='rgb(0,0,0)',xaxis_zeroline=False, yaxis_zeroline=False)
-	fig.update_xaxes(showticklabels=False,showgrid=False)
-	fig.update_yaxes(showticklabels=False,showgrid=False)
-	return fig
+	if N > 500000:
+		# Short scouting run fixes the canvas bounds; the full run is
+		# then generated and binned in one fused pass that never
+		# materializes a point buffer, on the GPU when one is present
+		_, _, xmin, xmax, ymin, ymax = f.getPointsAdv_affine(
+			10000, 0., 0., A, B, C, D, E, F, prob, alias)
+		xbounds = (xmin-0.2, xmax+0.2)
+		ybounds = (ymin-0.2, ymax+0.2)
+		bounds = (xbounds[0], xbounds[1], ybounds[0], ybounds[1])
+		if gpu.HAS_CUDA:
+			hist = gpu.bin_ifs_gpu(A, B, C, D, E, F, prob, alias, N, bounds)
+		else:
+			hist = EXECUTOR.submit(f.bin_ifs, A, B, C, D, E, F,
+				prob, alias, N, bounds).result()
+		agg = xr.DataArray(hist,
+			coords=[('y', np.linspace(*ybounds, 1500)),
+				('x', np.linspace(*xbounds, 1500))])
+	else:
+		xs, ys, xmin, xmax, ymin, ymax = EXECUTOR.submit(f.getPointsAdv_affine,
+			N, 0., 0., A, B, C, D, E, F, prob, alias).result()
+		xbounds = (xmin-0.2, xmax+0.2)
+		ybounds = (ymin-0.2, ymax+0.2)
+		hist = f.hist2d(xs, ys, (xbounds[0], xbounds[1], ybounds[0], ybounds[1]))
+		agg = xr.DataArray(hist,
+			coords=[('y', np.linspace(*ybounds, 1500)),
+				('x', np.linspace(*xbounds, 1500))])
+	img = ds.tf.set_background(ds.tf.shade(agg, how="log", cmap=cmap), "black")
+	png = img.to_bytesio('png').getvalue()
+	return 'data:image/png;base64,' + base64.b64encode(png).decode()
 
 #FINDER CALLBACK
 @app.callback(
@@ -423,11 +446,11 @@ def find_chaotic_map(_, kind, N_plot, N_trans, N_test, use_alphabet):
 
 	ret = cfind.dash_find_next_map(N_plot*1000, N_trans, N_test, use_alphabet, kind)
 
-	pts, args, max_le, min_le, fractal_dim = ret
+	xs, ys, args, max_le, min_le, fractal_dim = ret
 
-	df = pd.DataFrame(data=pts[:,:2], columns=["x", "y"])
-	xbounds = (pts[:, 0].min()-0.2, pts[:, 0].max()+0.2)
-	ybounds = (pts[:, 1].min()-0.2, pts[:, 1].max()+0.2)
+	df = pd.DataFrame({"x": xs, "y": ys}, copy=False)
+	xbounds = (xs.min()-0.2, xs.max()+0.2)
+	ybounds = (ys.min()-0.2, ys.max()+0.2)
 	cvs = ds.Canvas(plot_width=1500, plot_height=1500, 
 			x_range=xbounds, y_range=ybounds)
 	agg = cvs.points(df, 'x', 'y')
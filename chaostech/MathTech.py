@@ -8,7 +8,7 @@ PHI = (1 + np.sqrt(5))/2
 MIL = 10**6
 
 
-@njit
+@njit(cache=True)
 def random_choice(i, p):
 	arr = np.arange(i)
 	return arr[np.searchsorted(
@@ -16,7 +16,7 @@ def random_choice(i, p):
 		np.random.random(),
 		side="right")]
 
-@njit
+@njit(cache=True)
 def random_shuffle(arr):
 	num = arr.shape[0]
 	for i in range(num-1, 0, -1):
@@ -26,7 +26,7 @@ def random_shuffle(arr):
 		arr[r] = temp
 	return arr
 
-@njit
+@njit(cache=True)
 def random_swap(arr, num):
 	ln = arr.shape[0]
 	num = min(ln, num)
@@ -40,7 +40,7 @@ def random_swap(arr, num):
 
 
 
-@njit
+@njit(cache=True)
 def random_choice_fix(i, p, hard=True, soft=False):
 	arr = np.arange(i)
 	sum_ = np.sum(p)
@@ -55,6 +55,64 @@ def random_choice_fix(i, p, hard=True, soft=False):
 		side="right")]
 
 
+@njit(cache=True)
+def build_alias(p):
+	'''
+	Builds a Walker/Vose alias table for the weight vector p.
+	Returns (prob, alias) such that alias_draw_ picks index i with
+	probability p[i]/sum(p) in O(1) per draw.
+	'''
+	n = p.shape[0]
+	prob = np.empty(n)
+	alias = np.zeros(n, dtype=np.int32)
+	scaled = p*(n/np.sum(p))
+	small = np.empty(n, dtype=np.int32)
+	large = np.empty(n, dtype=np.int32)
+	ns = 0
+	nl = 0
+	for i in range(n):
+		if scaled[i] < 1.:
+			small[ns] = i
+			ns += 1
+		else:
+			large[nl] = i
+			nl += 1
+	while ns > 0 and nl > 0:
+		ns -= 1
+		nl -= 1
+		s = small[ns]
+		l = large[nl]
+		prob[s] = scaled[s]
+		alias[s] = l
+		scaled[l] += scaled[s] - 1.
+		if scaled[l] < 1.:
+			small[ns] = l
+			ns += 1
+		else:
+			large[nl] = l
+			nl += 1
+	while nl > 0:
+		nl -= 1
+		prob[large[nl]] = 1.
+	while ns > 0:
+		ns -= 1
+		prob[small[ns]] = 1.
+	return prob, alias
+
+@njit(inline='always')
+def alias_draw_(prob, alias, u):
+	'''
+	One O(1) weighted draw from a table built by build_alias, using
+	the uniform u in [0,1) (so callers can pre-draw all uniforms in
+	one bulk RNG call): two array loads and one compare.
+	'''
+	un = u*prob.shape[0]
+	i = int(un)
+	if un - i < prob[i]:
+		return i
+	return alias[i]
+
+
 class Order(IntEnum):
 	vertex = 1
 	linear = 2
@@ -4,6 +4,7 @@ from numba.experimental import jitclass
 
 spec = [
 	('heap', int32[:]),
+	('head', int32),
 	('ln', int32),
 	('offset', int32),
 	('s', int32),
@@ -25,11 +26,103 @@ def sign(x):
 		return 1
 
 
+# Free functions over the raw rule state. The hot
+# chaos-game loops call these on fields unpacked
+# once per kernel call, avoiding jitclass method
+# dispatch and attribute access per iteration.
+
+@njit(inline='always')
+def rule_get(heap, head):
+	# Oldest element sits at the head of the
+	# ring (the next slot to be overwritten)
+	return heap[head]
+
+@njit(inline='always')
+def rule_add(heap, head, ln, e):
+	if ln > 0:
+		heap[head] = e
+		head = (head + 1) % ln
+	return head
+
+@njit(inline='always')
+def rule_all(heap, ln):
+	# Branchless equality scan: XOR of adjacent
+	# elements accumulates to 0 iff all are equal
+	acc = 0
+	for i in range(ln-1):
+		acc |= heap[i] ^ heap[i+1]
+	return ln > 0 and acc == 0
+
+@njit
+def build_forbidden_mask(vln, offset, s, symmetry):
+	'''
+	Precomputes check's modular arithmetic into a
+	(vln, vln) boolean table indexed [ref, ind].
+	Built once per game; periodicity in ref makes
+	the sentinel ref == -1 wrap correctly.
+	'''
+	mask = np.zeros((vln, vln), dtype=np.bool_)
+	for ref in range(vln):
+		for ind in range(vln):
+			if symmetry:
+				mask[ref, ind] = (((ind - ref) % vln) == offset) or\
+					(((-ind + ref) % vln) == offset)
+			else:
+				mask[ref, ind] = ((s*(ind - ref) % vln) == offset)
+	return mask
+
+@njit
+def build_allowed_table(vln, offset, s, symmetry):
+	'''
+	Inverts the forbidden mask into per-reference rows of allowed
+	vertex indices plus their counts, so a constrained draw becomes
+	one table lookup instead of a rejection loop. Row -1 wraps to
+	vln-1, matching the heap's initial sentinel.
+	'''
+	mask = build_forbidden_mask(vln, offset, s, symmetry)
+	idx = np.zeros((vln, vln), dtype=np.int32)
+	counts = np.empty(vln, dtype=np.int32)
+	for ref in range(vln):
+		c = 0
+		for ind in range(vln):
+			if not mask[ref, ind]:
+				idx[ref, c] = ind
+				c += 1
+		counts[ref] = c
+	return idx, counts
+
+@njit(inline='always')
+def rule_check_mask(heap, head, ln, mask, ind):
+	#Returns TRUE if CANNOT be chosen
+	if not rule_all(heap, ln):
+		return False
+	ref = rule_get(heap, head)
+	return mask[ref, ind]
+
+@njit(inline='always')
+def rule_check(heap, head, ln, offset, s, symmetry, vln, ind):
+	#Returns TRUE if CANNOT be chosen
+	if not rule_all(heap, ln):
+		return False
+	ref = rule_get(heap, head)
+	if symmetry:
+		return (((ind - ref) % vln) == offset) or\
+		(((-ind + ref) % vln) == offset)
+	else:
+		return ((s*(ind - ref) % vln) == offset)
+
+
 @jitclass(spec)
 class Rule(object):
+	'''
+	Thin state holder for the rule ring buffer;
+	the methods delegate to the free functions
+	above
+	'''
 
 	def __init__(self, num=0, offset=0, symmetry=False):
 		self.heap = get_heap(num)
+		self.head = 0
 		self.ln = num
 		self.offset = np.abs(offset)
 		self.s = sign(offset)
@@ -37,34 +130,15 @@ class Rule(object):
 
 
 	def get(self):
-		return self.heap[0]
+		return rule_get(self.heap, self.head)
 
 	def add(self, e):
-		if self.ln > 0:
-			for i in range(self.ln-1):
-				self.heap[i] = self.heap[i+1]
-			self.heap[self.ln-1] = e
+		self.head = rule_add(self.heap, self.head, self.ln, e)
 
 	def all(self):
-		if self.ln > 0:
-			i = 0
-			equal = True
-			while equal and i < self.ln-1:
-				equal = (self.heap[i] == self.heap[i+1])
-				i += 1
-			return equal
-		else:
-			return False
+		return rule_all(self.heap, self.ln)
 
 	def check(self, vln, ind):
-		#Returns TRUE if CANNOT be chosen
-		if not self.all():
-			return False
-		ref = self.get()
-		ofs = self.offset
-		if self.symmetry:
-			return (((ind - ref) % vln) == ofs) or\
-			(((-ind + ref) % vln) == ofs)
-		else:
-			return ((self.s*(ind - ref) % vln) == ofs)
+		return rule_check(self.heap, self.head, self.ln,
+			self.offset, self.s, self.symmetry, vln, ind)
 
@@ -0,0 +1,124 @@
+'''
+Optional CUDA back end for the chaos game. Each GPU thread runs an
+independent chain and histograms its points with atomic adds, so no
+point buffer ever exists on either side -- only the (H, W) count grid
+comes back to the host. Only the unruled game is supported here; rule
+heaps are inherently sequential per chain and stay on the CPU path.
+
+Import is safe without a CUDA device; check HAS_CUDA before
+dispatching.
+'''
+import numpy as np
+from numba import cuda
+
+try:
+	from numba.cuda.random import (create_xoroshiro128p_states,
+		xoroshiro128p_uniform_float32)
+	HAS_CUDA = cuda.is_available()
+except Exception:
+	HAS_CUDA = False
+
+
+if HAS_CUDA:
+
+	@cuda.jit
+	def _chaos_kernel(vs, Ks, COSs, SINs, lnv, lnt, x0, y0, sx, sy,
+			W, H, hist, rng_states, iters):
+		t = cuda.grid(1)
+		if t >= rng_states.shape[0]:
+			return
+		x = 0.
+		y = 0.
+		for i in range(iters):
+			u = xoroshiro128p_uniform_float32(rng_states, t)
+			vi = int(u*lnv) % lnv
+			dx = vs[vi, 0] - x
+			dy = vs[vi, 1] - y
+			ti = vi % lnt
+			c = COSs[ti]
+			s = SINs[ti]
+			k = Ks[ti]
+			x += (dx*c - dy*s)*k
+			y += (dx*s + dy*c)*k
+			if i >= 50:
+				ix = int((x - x0)*sx)
+				iy = int((y - y0)*sy)
+				if 0 <= ix < W and 0 <= iy < H:
+					cuda.atomic.add(hist, (iy, ix), 1)
+
+
+	@cuda.jit
+	def _ifs_kernel(A, B, C, D, E, F, prob, alias, T, x0, y0, sx, sy,
+			W, H, hist, rng_states, iters):
+		t = cuda.grid(1)
+		if t >= rng_states.shape[0]:
+			return
+		x = 0.
+		y = 0.
+		for k in range(iters):
+			# alias-table draw from a single uniform: the integer part
+			# picks the column, the fractional part flips the coin
+			u = xoroshiro128p_uniform_float32(rng_states, t)*T
+			j = int(u) % T
+			if u - j < prob[j]:
+				i = j
+			else:
+				i = alias[j]
+			x, y = A[i]*x + B[i]*y + C[i], D[i]*x + E[i]*y + F[i]
+			if k >= 500:
+				ix = int((x - x0)*sx)
+				iy = int((y - y0)*sy)
+				if 0 <= ix < W and 0 <= iy < H:
+					cuda.atomic.add(hist, (iy, ix), 1)
+
+
+def bin_chaos_game_gpu(vs, T, N, bounds, W=1500, H=1500,
+		nthreads=65536, seed=None):
+	'''
+	GPU twin of Fractal.bin_chaos_game for the empty rule. Returns
+	the (H, W) int32 histogram over bounds = (x0, x1, y0, y1).
+	'''
+	x0, x1, y0, y1 = bounds
+	vs_ = np.ascontiguousarray(vs, dtype=np.float32)
+	Ks = np.ascontiguousarray(T[:, 0]).astype(np.float32)
+	COSs = np.cos(T[:, 1]).astype(np.float32)
+	SINs = np.sin(T[:, 1]).astype(np.float32)
+	# 50 warm-up iterations per chain before recording
+	iters = -(-N // nthreads) + 50
+	if seed is None:
+		seed = np.random.randint(2**31)
+	rng_states = create_xoroshiro128p_states(nthreads, seed=seed)
+	d_hist = cuda.to_device(np.zeros((H, W), dtype=np.int32))
+	tpb = 256
+	_chaos_kernel[nthreads // tpb, tpb](vs_, Ks, COSs, SINs,
+		vs.shape[0], T.shape[0], x0, y0, W/(x1 - x0), H/(y1 - y0),
+		W, H, d_hist, rng_states, iters)
+	return d_hist.copy_to_host()
+
+
+def bin_ifs_gpu(A, B, C, D, E, F, prob, alias, N, bounds,
+		W=1500, H=1500, nthreads=65536, seed=None):
+	'''
+	GPU twin of the affine IFS plot: every thread runs an independent
+	orbit with a 500-step discarded transient and histograms into a
+	shared (H, W) count grid. bounds = (x0, x1, y0, y1).
+	'''
+	x0, x1, y0, y1 = bounds
+	A_ = np.ascontiguousarray(A, dtype=np.float32)
+	B_ = np.ascontiguousarray(B, dtype=np.float32)
+	C_ = np.ascontiguousarray(C, dtype=np.float32)
+	D_ = np.ascontiguousarray(D, dtype=np.float32)
+	E_ = np.ascontiguousarray(E, dtype=np.float32)
+	F_ = np.ascontiguousarray(F, dtype=np.float32)
+	prob_ = np.ascontiguousarray(prob, dtype=np.float32)
+	alias_ = np.ascontiguousarray(alias, dtype=np.int32)
+	iters = -(-N // nthreads) + 500
+	if seed is None:
+		seed = np.random.randint(2**31)
+	rng_states = create_xoroshiro128p_states(nthreads, seed=seed)
+	d_hist = cuda.to_device(np.zeros((H, W), dtype=np.int32))
+	tpb = 256
+	_ifs_kernel[nthreads // tpb, tpb](A_, B_, C_, D_, E_, F_,
+		prob_, alias_, prob_.shape[0], x0, y0,
+		W/(x1 - x0), H/(y1 - y0), W, H, d_hist, rng_states, iters)
+	return d_hist.copy_to_host()
@@ -98,17 +98,16 @@ map_info_display = html.Label(
 	id='find-map-info',
 	children=["No map information to show"])
 
+# Alphabet-mode coefficient grid -> letter table,
+# built once at import (keyed on round(a, 1) so
+# -0.0 and float noise land on the grid)
+_INT_TO_CHR = {round(-1.2 + i*0.1, 1): chr(65+i) for i in range(25)}
+
 def format_map_info(args, max_le, min_le, fractal_dim, use_alphabet):
-	args = map(lambda x: round(x, 1), args)
 	if use_alphabet:
-		ints = [x/10 for x in range(-12, 13, 1)]
-		chrs = [chr(x) for x in range(65, 90)]
-		int_chr_dict = dict(zip(ints, chrs))
-		args_show = ''
-		for a in args:
-			args_show += int_chr_dict[a]
+		args_show = ''.join(_INT_TO_CHR[round(a, 1)] for a in args)
 	else:
-		args_show = str(list(args))
+		args_show = str([round(a, 1) for a in args])
 
 	fractal_dim = '> 2.0' if fractal_dim > 2.0 else fractal_dim
 
@@ -1,6 +1,7 @@
 import dash_bootstrap_components as dbc
 from dash import dcc
 from dash import html
+import functools
 import numpy as np
 import plotly.express as px 
 
@@ -144,7 +145,9 @@ probabilities_div = html.Div(className='txt', children = ["Probabilities: ",prob
 
 plot_button = dbc.Button('Plot', id='plot-button')
 
-graph = dcc.Graph(id='GRAPH2',
+# A plain <img> fed a PNG data URI -- plotly's interactive figure
+# machinery serialized the 1500x1500 raster to JSON on every plot
+graph = html.Img(id='GRAPH2',
 	style={'height': '100vh'})
 
 tab2 = html.Div(className = "TRANSFORMATIONS", 
@@ -170,19 +173,56 @@ tab2 = html.Div(className = "TRANSFORMATIONS",
 
 
 
-def read_args_from_string(string):
-	args_pre = string.split('\n')
-	params = list(filter(lambda x: x != '\n', args_pre))
-	params = list(map(lambda x: x.strip(), params))
-	params = list(map(lambda x: 'np.array(['+x+'])', params))
-	return list(map(
-		lambda x: eval(x),
-		params))
-
+# Borke-style rows list the coefficients as a,b,d,e,c,f; this
+# permutation rewrites them into the canonical a,b,c,d,e,f order
+_BORKE_ORDER = (0, 1, 4, 2, 3, 5)
+
+@functools.lru_cache(maxsize=64)
+def read_args_from_string(string, mode='regular'):
+	'''parse the textarea block into the canonical (N, 6) layout --
+	borke rows are permuted here, at parse time, so nothing
+	downstream ever branches on the parse mode. Memoized on the raw
+	string: replotting with more iterations skips the parse entirely'''
+	arr = np.array([l.split(',') for l in string.splitlines()
+		if l.strip()], dtype=np.float64)
+	if mode != 'regular':
+		arr = np.ascontiguousarray(arr[:, _BORKE_ORDER])
+	# The cached array is shared between callers; anyone who wants to
+	# mutate it has to copy first
+	arr.setflags(write=False)
+	return arr
+
+def unpack_ifs(arr):
+	'''(N, 6) coefficient array -> six contiguous float32 columns
+	a..f; single precision is plenty for pixel-quantized output and
+	halves the table the kernel keeps hot'''
+	return tuple(np.ascontiguousarray(arr[:, i], dtype=np.float32)
+		for i in range(6))
+
+@functools.lru_cache(maxsize=64)
 def read_probs_from_string(string):
-	probs = string.strip().split(',')
-	probs = list(map(lambda x: float(eval(x)), probs))
-	return np.array(probs)
+	probs = []
+	for tok in string.strip().split(','):
+		num, slash, den = tok.partition('/')
+		probs.append(float(num)/float(den) if slash else float(tok))
+	arr = np.array(probs)
+	arr.setflags(write=False)
+	return arr
+
+# Preset registry keyed by dropdown value, and the same presets parsed
+# once at import -- selecting one is a dict lookup, and the parse work
+# never lands inside a callback
+PRESETS = {
+	'MB_LIKE': (MB_LIKE, MB_LIKE_PROBS, 'regular'),
+	'SPIRAL': (SPIRAL, SPIRAL_PROBS, 'borke'),
+	'DRAGON': (DRAGON, DRAGON_PROBS, 'borke'),
+	'XMAS': (XMAS, XMAS_PROBS, 'borke'),
+	'FERN': (FERN, FERN_PROBS, 'borke'),
+	'LEAF': (LEAF, LEAF_PROBS, 'borke'),
+	'SIERPT': (SIERPT, SIERPT_PROBS, 'regular'),
+}
+PRESETS_PARSED = {name: (read_args_from_string(a, m),
+	read_probs_from_string(p)) for name, (a, p, m) in PRESETS.items()}
 
 
 